@@ -0,0 +1,66 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.denylist import get_token_denylist
+from app.core.hashing import password_hasher
+from app.core.metrics import StatsFamilies, registry
+from app.db.database import engine, replica_router
+from app.tasks.metrics import render_job_metrics
+from app.utils.cache import current_user_cache
+from app.utils.templates import renderer
+
+router = APIRouter(tags=["Metrics"])
+
+
+@registry.collector
+def service_stats() -> list[str]:
+    """
+    Connection pools, caches and executors of this process, read on every scrape.
+    """
+    families = StatsFamilies()
+    families.add("db_pool", "Primary connection pool.", engine.pool.stats())
+
+    for index, replica in enumerate(replica_router.replicas):
+        labels = {"replica": index}
+        families.add(
+            "db_replica_pool",
+            "Replica connection pool.",
+            replica.engine.pool.stats(),
+            labels,
+        )
+        families.add(
+            "db_replica",
+            "Replica health (1 if in rotation) and replication lag.",
+            {"healthy": int(replica.healthy), "lag_seconds": replica.lag_seconds or 0},
+            labels,
+        )
+    families.add(
+        "db_replica_router",
+        "Reads sent to the primary for lack of a healthy replica.",
+        {"primary_fallbacks": replica_router.primary_fallbacks},
+    )
+
+    cache = current_user_cache.stats()
+    lookups = cache["hits"] + cache["misses"]
+    cache["hit_ratio"] = cache["hits"] / lookups if lookups else 0.0
+    families.add("user_cache", "Authenticated user cache.", cache)
+
+    families.add("password_hasher", "bcrypt executor.", password_hasher.stats())
+    families.add("templates", "Email template renderer.", renderer.stats())
+    families.add(
+        "token_denylist", "Revoked token denylist.", get_token_denylist().stats()
+    )
+    return families.render()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Metrics of this API process and of the Celery workers in the
+    Prometheus text exposition format.
+    """
+    job_metrics = await render_job_metrics()
+    return PlainTextResponse(
+        registry.render() + "".join(f"{line}\n" for line in job_metrics),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -1,26 +1,37 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db_connection
-from app.db.models import User as UserModel
+from app.db.database import get_db_connection, get_read_db_connection
+from app.api.schemas.users import CurrentUser
 from app.api.schemas.tasks import (
     TaskCreate,
     TaskUpdate,
     TaskUpdateAdmin,
     Task as TaskSchema,
+    TaskPage,
+    TaskBulkResult,
+    TaskIds,
+    TaskBulkChangeResult,
+    TaskStats,
 )
 from app.services.task_service import TaskService
+from app.utils.etag import etag_matches, not_modified, task_etag
+from app.utils.responses import task_page_response
 from app.dependencies.deps import admin_required, get_current_user
 
+from app.core.config import get_settings
+
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+settings = get_settings()
+
 
 @router.post("/", response_model=TaskSchema)
 async def create_task(
     task_in: TaskCreate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_connection),
 ):
     """
@@ -30,51 +41,174 @@ async def create_task(
     return await TaskService.create_task(task_in, current_user, session)
 
 
-@router.get("/", response_model=list[TaskSchema])
-async def get_tasks(
-    level: Optional[str] = Query(default=None, min_length=1, max_length=1),
-    completed: Optional[bool] = Query(default=None),
-    current_user: UserModel = Depends(get_current_user),
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks_bulk(
+    tasks_in: list[dict] = Body(...),
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_connection),
 ):
     """
-    Retrieving a list of all tasks.
-    Query parameters: level (importance_level), completed (if completed_at is not Null).
+    Creating many tasks in one request, each item has the TaskCreate fields.
+    Invalid items are reported in "results" by their index, the valid ones are created.
+    At most TASKS_BULK_MAX_ITEMS items per request.
     Only accessible with a valid Access Token in the Authorization header.
     """
-    return await TaskService.get_all_tasks(level, completed, current_user, session)
+    return await TaskService.create_tasks_bulk(tasks_in, current_user, session)
 
 
-@router.get("/{task_id}", response_model=TaskSchema)
-async def get_task(
-    task_id: int,
-    current_user: UserModel = Depends(get_current_user),
+@router.patch("/bulk/complete", response_model=TaskBulkChangeResult)
+async def complete_tasks_bulk(
+    task_ids: TaskIds,
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_connection),
 ):
     """
-    Retrieving a specific task by its id.
+    Completing many tasks of the current user in one request.
+    The ids that were not completed are listed as not_found, not_owned
+    or already_completed. At most TASKS_BULK_MAX_ITEMS ids per request.
+    """
+    return await TaskService.complete_tasks_bulk(task_ids.ids, current_user, session)
+
+
+@router.post("/bulk/delete", response_model=TaskBulkChangeResult)
+async def delete_tasks_bulk(
+    task_ids: TaskIds,
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_connection),
+):
+    """
+    Deleting many tasks of the current user in one request.
+    The ids that were not deleted are listed as not_found or not_owned.
+    At most TASKS_BULK_MAX_ITEMS ids per request.
+    """
+    return await TaskService.delete_tasks_bulk(task_ids.ids, current_user, session)
+
+
+@router.get("/", response_model=TaskPage)
+async def get_tasks(
+    level: Optional[str] = Query(default=None, min_length=1, max_length=1),
+    completed: Optional[bool] = Query(default=None),
+    limit: int = Query(default=settings.TASKS_PAGE_SIZE, ge=1),
+    cursor: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db_connection),
+):
+    """
+    Retrieving a page of tasks, newest first.
+    Query parameters: level (importance_level), completed (if completed_at is not Null),
+    limit (page size, capped by the server), cursor (next_cursor of the previous page).
+    Responds 304 if the page still matches the ETag sent in If-None-Match.
     Only accessible with a valid Access Token in the Authorization header.
     """
-    return await TaskService.get_task_by_id(task_id, current_user, session)
+    if if_none_match:
+        etag = await TaskService.get_all_tasks_etag(
+            level, completed, limit, cursor, session
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
 
+    page = await TaskService.get_all_tasks(
+        level, completed, limit, cursor, current_user, session
+    )
+    return task_page_response(page, headers={"ETag": page["etag"]})
 
-@router.get("/my", response_model=list[TaskSchema])
+
+@router.get("/my", response_model=TaskPage)
 async def get_user_tasks(
-    current_user: UserModel = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_connection),
+    limit: int = Query(default=settings.TASKS_PAGE_SIZE, ge=1),
+    cursor: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db_connection),
 ):
     """
-    Retrieving a list of all user tasks.
+    Retrieving a page of user tasks, newest first.
+    Query parameters: limit (page size, capped by the server),
+    cursor (next_cursor of the previous page).
+    Responds 304 if the page still matches the ETag sent in If-None-Match.
     Only accessible with a valid Access Token in the Authorization header.
     """
-    return await TaskService.get_my_tasks(current_user, session)
+    if if_none_match:
+        etag = await TaskService.get_my_tasks_etag(limit, cursor, current_user, session)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    page = await TaskService.get_my_tasks(limit, cursor, current_user, session)
+    return task_page_response(page, headers={"ETag": page["etag"]})
+
+
+@router.get("/search", response_model=TaskPage)
+async def search_tasks(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=settings.TASKS_PAGE_SIZE, ge=1),
+    cursor: Optional[str] = Query(default=None),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db_connection),
+):
+    """
+    Full-text search of tasks by title and content, best matches first.
+    Query parameters: q (words, "quoted phrases", -excluded words, OR),
+    limit (page size, capped by the server), cursor (next_cursor of the previous page).
+    Only accessible with a valid Access Token in the Authorization header.
+    """
+    page = await TaskService.search_tasks(q, limit, cursor, current_user, session)
+    return task_page_response(page)
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_user_task_stats(
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db_connection),
+):
+    """
+    Open, completed and overdue task counts of the current user per
+    importance level, with the average completion time in seconds.
+    Only accessible with a valid Access Token in the Authorization header.
+    """
+    return await TaskService.get_task_stats(current_user.id, session)
+
+
+@router.get("/stats/all", response_model=TaskStats)
+async def get_all_task_stats(
+    session: AsyncSession = Depends(get_read_db_connection),
+    admin: CurrentUser = Depends(admin_required),
+):
+    """
+    Task statistics of all users, same fields as GET /tasks/stats.
+    Only available to users with administrative privileges only.
+    """
+    return await TaskService.get_task_stats(None, session)
+
+
+@router.get("/{task_id}", response_model=TaskSchema)
+async def get_task(
+    task_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db_connection),
+):
+    """
+    Retrieving a specific task by its id.
+    Responds 304 if the task still matches the ETag sent in If-None-Match.
+    Only accessible with a valid Access Token in the Authorization header.
+    """
+    if if_none_match:
+        etag = await TaskService.get_task_etag(task_id, session)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    task = await TaskService.get_task_by_id(task_id, current_user, session)
+    response.headers["ETag"] = task_etag(task)
+    return task
 
 
 @router.patch("/{task_id}", response_model=TaskSchema)
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_connection),
 ):
     """
@@ -87,7 +221,7 @@ async def update_task(
 @router.patch("/complete/{task_id}", response_model=TaskSchema)
 async def complete_task(
     task_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_connection),
 ):
     """
@@ -102,7 +236,7 @@ async def create_remark(
     task_id: int,
     task_update: TaskUpdateAdmin,
     session: AsyncSession = Depends(get_db_connection),
-    admin: UserModel = Depends(admin_required),
+    admin: CurrentUser = Depends(admin_required),
 ):
     """
     Creating a remark for a specific task.
@@ -114,7 +248,7 @@ async def create_remark(
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_connection),
 ):
     """
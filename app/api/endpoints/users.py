@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db_connection
-from app.db.models import User as UserModel
-from app.api.schemas.users import UserCreate, User as UserSchema
+from app.db.database import get_db_connection, get_read_db_connection
+from app.api.schemas.users import CurrentUser, UserCreate, User as UserSchema
 
 from app.core.config import get_settings
 from app.services.user_service import UserService
 from app.dependencies.deps import admin_required
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -28,34 +30,56 @@ async def signup(user: UserCreate, session: AsyncSession = Depends(get_db_connec
 
 @router.get("/", response_model=list[UserSchema])
 async def get_users(
-    session: AsyncSession = Depends(get_db_connection),
-    admin: UserModel = Depends(admin_required),
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_read_db_connection),
+    admin: CurrentUser = Depends(admin_required),
 ):
     """
     Extracts all users from the database.
+    Responds 304 if the list still matches the ETag sent in If-None-Match.
     Only available to users with administrative privileges only.
     """
-    return await UserService.get_users(session)
+    if if_none_match:
+        etag = await UserService.get_users_etag(session)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    users = await UserService.get_users(session)
+    response.headers["ETag"] = make_etag(
+        len(users), max((user.id for user in users), default=None)
+    )
+    return users
 
 
 @router.get("/{user_id}", response_model=UserSchema)
 async def get_user(
     user_id: int,
-    session: AsyncSession = Depends(get_db_connection),
-    admin: UserModel = Depends(admin_required),
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_read_db_connection),
+    admin: CurrentUser = Depends(admin_required),
 ):
     """
     Returns a user by their id.
+    Responds 304 if the user still matches the ETag sent in If-None-Match.
     Only available to users with administrative privileges only.
     """
-    return await UserService.get_user_by_id(user_id, session)
+    if if_none_match:
+        etag = await UserService.get_user_etag(user_id, session)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    user = await UserService.get_user_by_id(user_id, session)
+    response.headers["ETag"] = make_etag(user.id)
+    return user
 
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
     session: AsyncSession = Depends(get_db_connection),
-    admin: UserModel = Depends(admin_required),
+    admin: CurrentUser = Depends(admin_required),
 ):
     """
     Deletes a user by their ID.
@@ -1,15 +1,16 @@
 from pydantic import (
     BaseModel,
     ConfigDict,
+    Field,
     StringConstraints,
     field_validator,
     PlainSerializer,
 )
 from datetime import datetime
 from typing import Optional, Annotated
-from zoneinfo import ZoneInfo
 
 from app.core.config import get_settings
+from app.utils.timefmt import format_local
 
 settings = get_settings()
 
@@ -24,14 +25,14 @@ class TaskCreate(TaskBase):
     @field_validator("title")
     @classmethod
     def check_title(cls, title: str) -> str:
-        if not title[0].isupper():
+        if not title[:1].isupper():
             raise ValueError("Заголовок должен начинаться с заглавной буквы!")
         return title
 
     @field_validator("content")
     @classmethod
     def check_content(cls, content: str) -> str:
-        if not content[0].isupper():
+        if not content[:1].isupper():
             raise ValueError("Содержание задачи должно начинаться с заглавной буквы!")
         return content
 
@@ -60,14 +61,7 @@ class TaskUpdateAdmin(BaseModel):
 
 
 # Custom datetime object output based on the time zone
-LOCAL_TZ = ZoneInfo(settings.TZ_IANA)
-
-DateTimeHuman = Annotated[
-    datetime,
-    PlainSerializer(
-        lambda dt: dt.astimezone(LOCAL_TZ).strftime("%Y-%m-%d %H:%M"), return_type=str
-    ),
-]
+DateTimeHuman = Annotated[datetime, PlainSerializer(format_local, return_type=str)]
 
 
 class Task(TaskBase):
@@ -80,3 +74,43 @@ class Task(TaskBase):
     completed_at: DateTimeHuman | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TaskPage(BaseModel):
+    items: list[Task]
+    next_cursor: str | None = None
+
+
+class TaskBulkItem(BaseModel):
+    index: int
+    task: Task | None = None
+    errors: list[str] | None = None
+
+
+class TaskBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: list[TaskBulkItem]
+
+
+class TaskIds(BaseModel):
+    ids: Annotated[list[int], Field(min_length=1)]
+
+
+class TaskBulkChangeResult(BaseModel):
+    succeeded: list[int]
+    not_found: list[int]
+    not_owned: list[int]
+    already_completed: list[int]
+
+
+class TaskLevelStats(BaseModel):
+    open: int = 0
+    completed: int = 0
+    overdue: int = 0
+    avg_completion_seconds: float | None = None
+
+
+class TaskStats(BaseModel):
+    levels: dict[str, TaskLevelStats]
+    total: TaskLevelStats
@@ -88,6 +88,19 @@ class User(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CurrentUser(BaseModel):
+    """
+    Immutable snapshot of the authenticated user,
+    kept in the per-process cache of get_current_user.
+    """
+
+    id: int
+    email: str
+    is_superuser: bool
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+
 class UserLogin(BaseModel):
     email: str
     password: str
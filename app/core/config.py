@@ -6,6 +6,20 @@ class Settings(BaseSettings):
     # DATABASE
     DATABASE_URL: str
     TEST_DATABASE_URL: str | None = None
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Opt-in: a round trip on every checkout to drop connections the server closed
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Read replicas for read-only endpoints (JSON list in the environment)
+    REPLICA_DATABASE_URLS: list[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: float = 1.0
 
     # JWT | Security
     SECRET_KEY: str
@@ -13,6 +27,20 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Revoked refresh tokens: "sql" or "redis" (REDIS_URL + in-process Bloom filter)
+    TOKEN_DENYLIST_BACKEND: str = "sql"
+    TOKEN_DENYLIST_BLOOM_CAPACITY: int = 100_000
+    TOKEN_DENYLIST_BLOOM_ERROR_RATE: float = 0.01
+
+    # Cleanup of expired revoked tokens
+    TOKEN_CLEANUP_BATCH_SIZE: int = 5000
+    TOKEN_CLEANUP_PAUSE_SECONDS: float = 0.5
+    TOKEN_CLEANUP_TIME_BUDGET_SECONDS: int = 600
+
+    # Password hashing (bcrypt) executor
+    HASHING_WORKERS: int = 4
+    HASHING_MAX_PENDING: int = 64
+
     # Mail
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
@@ -20,6 +48,15 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 465
     MAIL_SERVER: str = "smtp.mail.ru"
     MAIL_FROM_NAME: str = "TaskManager API"
+    MAIL_POOL_SIZE: int = 4
+    MAIL_MAX_MESSAGES_PER_CONNECTION: int = 100
+
+    # Notification jobs: tasks loaded, sent and flagged per batch
+    NOTIFICATION_BATCH_SIZE: int = 200
+
+    # Notification outbox: pending rows older than the delay are re-dispatched
+    NOTIFICATION_RELAY_DELAY_SECONDS: int = 60
+    NOTIFICATION_MAX_ATTEMPTS: int = 10
 
     # Admin mail
     ADMIN_EMAIL: str = "admin@example.com"
@@ -33,6 +70,39 @@ class Settings(BaseSettings):
     # Last work hour
     LAST_HOUR: int = 18
 
+    # Authenticated user cache (per process)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAXSIZE: int = 10_000
+
+    # Logging: "dev" (colored console and log files, two lines per request)
+    # or "json" (one structured record per request to stdout, written by a
+    # background thread). In json mode 2xx/3xx requests are sampled with
+    # LOG_ACCESS_SAMPLE_RATE; errors and slow requests are always logged.
+    LOG_MODE: str = "dev"
+    LOG_LEVEL: str = "INFO"
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0
+    LOG_SLOW_REQUEST_SECONDS: float = 1.0
+
+    # GET /metrics (Prometheus text format) and the request metrics middleware
+    METRICS_ENABLED: bool = True
+    # Redis round trips of the Celery job metrics (scrape and job signal)
+    METRICS_REDIS_TIMEOUT_SECONDS: float = 0.5
+
+    # SQL profiling per request (opt-in): statement count and DB time in the
+    # Server-Timing header, warnings for requests with too many statements or
+    # with slow ones, EXPLAIN of a sample of the slow statements
+    SQL_PROFILING_ENABLED: bool = False
+    SQL_PROFILING_MAX_QUERIES: int = 20
+    SQL_PROFILING_SLOW_QUERY_SECONDS: float = 0.2
+    SQL_PROFILING_EXPLAIN_SAMPLE_RATE: float = 0.1
+
+    # Pagination
+    TASKS_PAGE_SIZE: int = 50
+    TASKS_PAGE_SIZE_MAX: int = 200
+
+    # Bulk operations: max tasks (or task ids) accepted by the /tasks/bulk endpoints
+    TASKS_BULK_MAX_ITEMS: int = 1000
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,157 @@
+import datetime
+import hashlib
+import math
+from functools import lru_cache
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import RevokedToken
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class BloomFilter:
+    """
+    In-process Bloom filter: `item in bloom` is never False for an added item,
+    and is True for a missing one with probability about `error_rate`.
+    Starts over once `capacity` items were added, to keep that rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        if self.count >= self.capacity:
+            self.clear()
+
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+
+class TokenDenylist:
+    """
+    Storage of revoked refresh token JTIs.
+    The SQL table is written in every case: it is the audit trail
+    and the fallback of the faster backends.
+    """
+
+    async def is_revoked(self, jti: str, session: AsyncSession) -> bool:
+        query = select(RevokedToken.id).where(RevokedToken.jti == jti)
+        result = await session.execute(query)
+        return result.first() is not None
+
+    async def revoke(
+        self, jti: str, expires_at: datetime.datetime, session: AsyncSession
+    ) -> bool:
+        """
+        Adds the JTI to the denylist (committed by the caller).
+        Returns False if it turned out to be revoked already.
+        """
+        session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        return True
+
+    def stats(self) -> dict:
+        return {}
+
+
+class RedisTokenDenylist(TokenDenylist):
+    """
+    Keeps every revoked JTI in Redis until the token expires, with a Bloom
+    filter of the JTIs revoked by this process in front of it.
+
+    The filter cannot know about revocations made by other workers, so
+    revoke() is an atomic SET NX: a token revoked elsewhere is still caught there.
+    If Redis is unavailable, both operations fall back to the SQL table.
+    """
+
+    def __init__(self, client: redis.Redis, bloom: BloomFilter):
+        self.client = client
+        self.bloom = bloom
+        self.bloom_skips = 0
+        self.redis_lookups = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def _key(jti: str) -> str:
+        return f"revoked_jti:{jti}"
+
+    async def is_revoked(self, jti: str, session: AsyncSession) -> bool:
+        if jti not in self.bloom:
+            self.bloom_skips += 1
+            return False
+
+        try:
+            self.redis_lookups += 1
+            return bool(await self.client.exists(self._key(jti)))
+        except RedisError as e:
+            logger.warning(f"Denylist falls back to SQL: {e}")
+            self.fallbacks += 1
+            return await super().is_revoked(jti, session)
+
+    async def revoke(
+        self, jti: str, expires_at: datetime.datetime, session: AsyncSession
+    ) -> bool:
+        await super().revoke(jti, expires_at, session)
+        self.bloom.add(jti)
+
+        try:
+            created = await self.client.set(
+                self._key(jti), 1, nx=True, exat=int(expires_at.timestamp()) + 1
+            )
+        except RedisError as e:
+            logger.warning(f"Denylist falls back to SQL: {e}")
+            self.fallbacks += 1
+            return True
+
+        return bool(created)
+
+    def stats(self) -> dict:
+        return {
+            "bloom_items": self.bloom.count,
+            "bloom_skips": self.bloom_skips,
+            "redis_lookups": self.redis_lookups,
+            "fallbacks": self.fallbacks,
+        }
+
+
+@lru_cache
+def get_token_denylist() -> TokenDenylist:
+    """
+    Denylist backend selected by TOKEN_DENYLIST_BACKEND ("sql" or "redis").
+    """
+    if settings.TOKEN_DENYLIST_BACKEND == "redis":
+        return RedisTokenDenylist(
+            redis.from_url(settings.REDIS_URL),
+            BloomFilter(
+                settings.TOKEN_DENYLIST_BLOOM_CAPACITY,
+                settings.TOKEN_DENYLIST_BLOOM_ERROR_RATE,
+            ),
+        )
+
+    return TokenDenylist()
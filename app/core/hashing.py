@@ -0,0 +1,64 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app.exceptions.users import HashingOverloadedException
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated thread pool so that hashing never blocks
+    the event loop (bcrypt releases the GIL while it works).
+    At most `workers` hashes run at once; once `max_pending` calls are
+    running or queued, new ones are rejected instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+
+    async def _run(self, func, *args):
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise HashingOverloadedException()
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(
+            bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt()
+        )
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(
+            bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.HASHING_WORKERS, max_pending=settings.HASHING_MAX_PENDING
+)
@@ -0,0 +1,254 @@
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+# Latency buckets in seconds, shared by the HTTP and Celery histograms
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base of the in-process metrics. Values are plain dicts keyed by label
+    values and only updated from the event loop thread, so no locks are taken.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        return self.header() + [
+            f"{self.name}{_labels(self.labels, key)} {_number(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value: float):
+        self._values[label_values] = value
+
+
+class Histogram(Metric):
+    """
+    Histogram with fixed bucket bounds: an observation increments a single
+    per-bucket count found by bisection; the counts are made cumulative
+    only when rendered.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, *label_values):
+        counts = self._counts.get(label_values)
+        if counts is None:
+            counts = self._counts[label_values] = [0] * (len(self.buckets) + 1)
+            self._sums[label_values] = 0.0
+
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[label_values] += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for key, counts in self._counts.items():
+            lines.extend(
+                render_histogram(
+                    self.name, self.labels, key, self.buckets, counts, self._sums[key]
+                )
+            )
+        return lines
+
+
+def render_histogram(
+    name: str,
+    labels: tuple,
+    key: tuple,
+    buckets: tuple,
+    counts: list[int],
+    total: float,
+) -> list[str]:
+    """
+    Exposition lines of one histogram series from its per-bucket counts
+    (the last count is for observations above the largest bound).
+    """
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*buckets, "+Inf"), counts):
+        cumulative += count
+        le = f'le="{bound}"'
+        lines.append(f"{name}_bucket{_labels(labels, key, le)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels, key)} {_number(total)}")
+    lines.append(f"{name}_count{_labels(labels, key)} {cumulative}")
+    return lines
+
+
+# Keys of stats() dicts whose values only grow: exported as counters
+COUNTER_STATS = frozenset(
+    {
+        "checkouts",
+        "timeouts",
+        "wait_seconds",
+        "hits",
+        "misses",
+        "rejected",
+        "bloom_skips",
+        "redis_lookups",
+        "fallbacks",
+        "rendered",
+        "compile_seconds",
+        "render_seconds",
+        "primary_fallbacks",
+    }
+)
+
+
+class StatsFamilies:
+    """
+    Numeric values of stats() dicts as metric families named <prefix>_<key>
+    (plus _total for the COUNTER_STATS keys). A family is rendered once, with
+    the samples of every label set it was added with, e.g. one per replica.
+    """
+
+    def __init__(self):
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def add(self, prefix: str, help: str, stats: dict, labels: dict = None):
+        label_names = tuple(labels or ())
+        label_values = tuple((labels or {}).values())
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            kind = "counter" if key in COUNTER_STATS else "gauge"
+            name = f"{prefix}_{key}_total" if kind == "counter" else f"{prefix}_{key}"
+            family = self._families.setdefault(name, (help, kind, []))
+            family[2].append(
+                f"{name}{_labels(label_names, label_values)} {_number(value)}"
+            )
+
+    def render(self) -> list[str]:
+        lines = []
+        for name, (help, kind, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return lines
+
+
+class Registry:
+    """
+    Metrics of this process plus collectors, called on every scrape,
+    that report the stats() of pools, caches and executors.
+    """
+
+    def __init__(self):
+        self.metrics: list[Metric] = []
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: tuple = (), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def collector(self, collect: Callable[[], Iterable[str]]):
+        self.collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Handled requests.", ("method", "route", "status")
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Request latency.", ("method", "route")
+)
+HTTP_IN_FLIGHT = registry.gauge("http_requests_in_flight", "Requests being handled.")
+
+# Incremented by MailSender in the Celery workers. Not rendered by this process:
+# the workers add it up in Redis, see app/tasks/metrics.py
+EMAILS_SENT = Counter("emails_sent_total", "Letters accepted by SMTP.")
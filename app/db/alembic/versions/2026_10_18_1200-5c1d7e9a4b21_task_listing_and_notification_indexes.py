@@ -0,0 +1,77 @@
+"""task listing and notification indexes
+
+Revision ID: 5c1d7e9a4b21
+Revises: cf8b34fa34dc
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d7e9a4b21"
+down_revision: Union[str, Sequence[str], None] = "cf8b34fa34dc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_A = "importance_level = 'A' AND completed_at IS NULL"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction, but keeps the table writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_created_at_id",
+            "tasks",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_user_id_created_at_id",
+            "tasks",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_level_created_at_id",
+            "tasks",
+            ["importance_level", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_open_a_deadline",
+            "tasks",
+            ["deadline_date"],
+            unique=False,
+            postgresql_where=sa.text(OPEN_A),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_overdue_pending_deadline",
+            "tasks",
+            ["deadline_date"],
+            unique=False,
+            postgresql_where=sa.text(f"{OPEN_A} AND overdue_notified IS false"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_tasks_overdue_pending_deadline",
+            "ix_tasks_open_a_deadline",
+            "ix_tasks_level_created_at_id",
+            "ix_tasks_user_id_created_at_id",
+            "ix_tasks_created_at_id",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
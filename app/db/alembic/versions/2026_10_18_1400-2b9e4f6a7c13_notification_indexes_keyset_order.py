@@ -0,0 +1,83 @@
+"""notification indexes in keyset order
+
+Revision ID: 2b9e4f6a7c13
+Revises: 8f2a6c3d1e47
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b9e4f6a7c13"
+down_revision: Union[str, Sequence[str], None] = "8f2a6c3d1e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_A = "importance_level = 'A' AND completed_at IS NULL"
+OVERDUE_PENDING = f"{OPEN_A} AND overdue_notified IS false"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Level A deadlines share LAST_HOUR:00, so the batches page by (deadline, id)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_a_deadline_id",
+            "tasks",
+            ["deadline_date", "id"],
+            unique=False,
+            postgresql_where=sa.text(OPEN_A),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_overdue_pending_deadline_id",
+            "tasks",
+            ["deadline_date", "id"],
+            unique=False,
+            postgresql_where=sa.text(OVERDUE_PENDING),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_open_a_deadline", table_name="tasks", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_tasks_overdue_pending_deadline",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_a_deadline",
+            "tasks",
+            ["deadline_date"],
+            unique=False,
+            postgresql_where=sa.text(OPEN_A),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_overdue_pending_deadline",
+            "tasks",
+            ["deadline_date"],
+            unique=False,
+            postgresql_where=sa.text(OVERDUE_PENDING),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_open_a_deadline_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_tasks_overdue_pending_deadline_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,41 @@
+"""revoked_tokens expires_at index
+
+Revision ID: d4a8b2e6f915
+Revises: 2b9e4f6a7c13
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8b2e6f915"
+down_revision: Union[str, Sequence[str], None] = "2b9e4f6a7c13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_revoked_tokens_expires_at"),
+            "revoked_tokens",
+            ["expires_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_revoked_tokens_expires_at"),
+            table_name="revoked_tokens",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,69 @@
+"""create task stats table
+
+Revision ID: e7c3f1a9b5d2
+Revises: d4a8b2e6f915
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c3f1a9b5d2"
+down_revision: Union[str, Sequence[str], None] = "d4a8b2e6f915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("importance_level", sa.String(length=1), nullable=False),
+        sa.Column("open_count", sa.Integer(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+        sa.Column("completion_seconds", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "importance_level"),
+    )
+    # Backfill from the existing tasks
+    op.execute(
+        """
+        INSERT INTO task_stats
+            (user_id, importance_level, open_count, completed_count, completion_seconds)
+        SELECT
+            user_id,
+            importance_level,
+            count(*) FILTER (WHERE completed_at IS NULL),
+            count(*) FILTER (WHERE completed_at IS NOT NULL),
+            coalesce(extract(epoch FROM sum(completed_at - created_at)), 0)
+        FROM tasks
+        GROUP BY user_id, importance_level
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_user_id_deadline",
+            "tasks",
+            ["user_id", "deadline_date"],
+            unique=False,
+            postgresql_where=sa.text("completed_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_open_user_id_deadline",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+    op.drop_table("task_stats")
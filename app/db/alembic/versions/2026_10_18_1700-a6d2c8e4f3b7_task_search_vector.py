@@ -0,0 +1,57 @@
+"""task search vector
+
+Revision ID: a6d2c8e4f3b7
+Revises: e7c3f1a9b5d2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d2c8e4f3b7"
+down_revision: Union[str, Sequence[str], None] = "e7c3f1a9b5d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rewrites the tasks table
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('russian', title || ' ' || content)", persisted=True
+            ),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_search_vector",
+            "tasks",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_search_vector",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("tasks", "search_vector")
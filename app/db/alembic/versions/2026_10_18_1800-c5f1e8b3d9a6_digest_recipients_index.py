@@ -0,0 +1,42 @@
+"""digest recipients index
+
+Revision ID: c5f1e8b3d9a6
+Revises: a6d2c8e4f3b7
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f1e8b3d9a6"
+down_revision: Union[str, Sequence[str], None] = "a6d2c8e4f3b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_open_a_user_id_deadline",
+            "tasks",
+            ["user_id", "deadline_date"],
+            unique=False,
+            postgresql_where=sa.text("importance_level = 'A' AND completed_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_open_a_user_id_deadline",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
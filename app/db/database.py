@@ -1,5 +1,11 @@
-from sqlalchemy import create_engine
+import asyncio
+import time
+
+from loguru import logger
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.future import select
@@ -9,11 +15,172 @@ from app.core.config import get_settings
 settings = get_settings()
 
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool that also measures checkouts:
+    how many there were and how long they waited for a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+def create_engine_from_settings(url: str):
+    """
+    Creates an async engine with the pool options from Settings.
+    Every uvicorn worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections,
+    so workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay below
+    the max_connections of Postgres.
+    """
+    options = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        # 0 disables the caches, which is required behind pgbouncer
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        **options,
+    )
+
+
+engine = create_engine_from_settings(settings.DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+# Seconds a replica is behind the primary (0 when it has replayed everything)
+REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine = create_engine_from_settings(url)
+        self.sessionmaker = sessionmaker(
+            self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.healthy = True
+        self.lag_seconds = 0.0
+        self.checked_at = float("-inf")
+
+
+class ReplicaRouter:
+    """
+    Hands out read-only sessions round-robin across the replicas.
+    A replica is health-checked at most once per
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS; one that is unreachable, does not
+    answer within REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS or lags more than
+    REPLICA_MAX_LAG_SECONDS is skipped until the next check.
+    Without a healthy replica, reads go to the primary.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self.primary_fallbacks = 0
+        self._next = 0
+
+    @staticmethod
+    async def _replica_lag(replica: Replica):
+        async with replica.engine.connect() as connection:
+            return (await connection.execute(REPLICA_LAG)).scalar()
+
+    async def _is_healthy(self, replica: Replica) -> bool:
+        now = time.monotonic()
+        if now - replica.checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS:
+            return replica.healthy
+
+        # Set before awaiting, so concurrent requests do not check it again
+        replica.checked_at = now
+        try:
+            lag = await asyncio.wait_for(
+                self._replica_lag(replica),
+                settings.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS,
+            )
+            replica.lag_seconds = float(lag or 0)
+            replica.healthy = replica.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+        except (OSError, TimeoutError, exc.SQLAlchemyError) as e:
+            logger.warning(f"Replica {replica.engine.url!r} is unavailable: {e}")
+            replica.healthy = False
+
+        return replica.healthy
+
+    async def read_sessionmaker(self):
+        for _ in self.replicas:
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+
+            if await self._is_healthy(replica):
+                return replica.sessionmaker
+
+        if self.replicas:
+            self.primary_fallbacks += 1
+        return AsyncSessionLocal
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "url": repr(replica.engine.url),
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+            }
+            for replica in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter(settings.REPLICA_DATABASE_URLS)
+
+
 async def get_db_connection():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db_connection():
+    """
+    Session for read-only endpoints: a healthy replica, or the primary.
+    Writes must keep using get_db_connection.
+    """
+    session_factory = await replica_router.read_sessionmaker()
+    async with session_factory() as session:
+        yield session
@@ -1,11 +1,21 @@
 from datetime import datetime, timezone
 from typing import List
-from sqlalchemy import func
-from sqlalchemy import String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import func, text
+from sqlalchemy import String, DateTime, ForeignKey, Text, Boolean, Index, Integer
+from sqlalchemy import Computed, Float
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
+# Text search configuration of tasks.search_vector, also used by the search
+# query so both stem alike. Baked into the column: changing it needs a migration
+SEARCH_TS_CONFIG = "russian"
+
+# Stemmed title and content of a task for GET /tasks/search
+TASK_SEARCH_VECTOR = f"to_tsvector('{SEARCH_TS_CONFIG}', title || ' ' || content)"
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -22,17 +32,55 @@ class User(Base):
     phone: Mapped[str] = mapped_column(String(11), unique=True, nullable=False)
 
     # relationship: task
+    # Never loaded implicitly: queries that need it must ask for it with loader options
     tasks: Mapped[List["Task"]] = relationship(
         "Task",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True,
     )
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination of GET /tasks, GET /tasks/my and the level filter
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_level_created_at_id", "importance_level", "created_at", "id"),
+        # Notification scans: open level A tasks in (deadline, id) keyset order
+        Index(
+            "ix_tasks_open_a_deadline_id",
+            "deadline_date",
+            "id",
+            postgresql_where=text("importance_level = 'A' AND completed_at IS NULL"),
+        ),
+        Index(
+            "ix_tasks_overdue_pending_deadline_id",
+            "deadline_date",
+            "id",
+            postgresql_where=text(
+                "importance_level = 'A' AND completed_at IS NULL "
+                "AND overdue_notified IS false"
+            ),
+        ),
+        # Digest recipients: open level A tasks in user_id order
+        Index(
+            "ix_tasks_open_a_user_id_deadline",
+            "user_id",
+            "deadline_date",
+            postgresql_where=text("importance_level = 'A' AND completed_at IS NULL"),
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Overdue counts of GET /tasks/stats: only open tasks are indexed
+        Index(
+            "ix_tasks_open_user_id_deadline",
+            "user_id",
+            "deadline_date",
+            postgresql_where=text("completed_at IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(150), nullable=False)
@@ -57,13 +105,26 @@ class Task(Base):
     overdue_notified: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=True
     )
+    # Maintained by Postgres; only the search query reads it.
+    # Deferred for reads; eager_defaults below keeps it out of INSERT ... RETURNING
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(TASK_SEARCH_VECTOR, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
     # relationship: user
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
     #  to establish a bidirectional relationship
-    user: Mapped["User"] = relationship("User", back_populates="tasks", lazy="selectin")
+    #  (loaded per query, see AUTHOR_EMAIL in app/services/task_service.py)
+    user: Mapped["User"] = relationship("User", back_populates="tasks", lazy="raise")
+
+    # Server-generated values (search_vector, created_at, updated_at) are expired
+    # after a flush instead of returned: writers re-select the task, see _get_task
+    __mapper_args__ = {"eager_defaults": False}
 
     @property
     def user_email(self) -> str:
@@ -81,5 +142,52 @@ class RevokedToken(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     jti: Mapped[str] = mapped_column(unique=True, nullable=False, index=True)
     expires_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+
+class NotificationOutbox(Base):
+    """
+    Transactional outbox for task notifications: a row is written in the
+    same transaction as the task and marked as sent once the letter is delivered.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_pending",
+            "created_at",
+            postgresql_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task_id: Mapped[int] = mapped_column(
+        ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    template: Mapped[str] = mapped_column(String(100), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    task: Mapped["Task"] = relationship("Task", lazy="raise")
+
+
+class TaskStats(Base):
+    """
+    Task counters per author and importance level, kept up to date by
+    TaskService in the same transaction as the task changes.
+    """
+
+    __tablename__ = "task_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
+    importance_level: Mapped[str] = mapped_column(String(1), primary_key=True)
+    open_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Sum of (completed_at - created_at) over the completed tasks
+    completion_seconds: Mapped[float] = mapped_column(Float, default=0, nullable=False)
@@ -0,0 +1,59 @@
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class QueryProfile:
+    """
+    Statements executed while handling one request.
+    Slow statements are kept with their parameters for EXPLAIN.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slow: list[tuple[str, object, float]] = []
+
+
+# Set by sql_profiling_middleware; None outside of profiled requests
+current_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is dropped along with a failed statement
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+
+    profile = current_profile.get()
+    if profile is None:
+        return
+
+    profile.queries += 1
+    profile.db_seconds += elapsed
+
+    if elapsed >= settings.SQL_PROFILING_SLOW_QUERY_SECONDS and not executemany:
+        profile.slow.append((statement, parameters, elapsed))
+
+
+def install_sql_profiling(engine: AsyncEngine):
+    """
+    Times every statement of the engine and adds it to the profile
+    of the current request, if any.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
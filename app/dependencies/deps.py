@@ -1,3 +1,4 @@
+from fastapi import Request
 from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -8,17 +9,22 @@ from app.exceptions.users import (
     AdminAccessRequired,
 )
 from app.exceptions.tokens import InvalidTokenTypeException, InvalidTokenException
+from app.api.schemas.users import CurrentUser
 from app.db.models import User as UserModel
 from app.db.database import get_db_connection
+from app.utils.cache import current_user_cache
 
 
 async def get_current_user(
+    request: Request,
     payload: dict = Depends(decode_jwt_token),
     session: AsyncSession = Depends(get_db_connection),
-) -> UserModel:
+) -> CurrentUser:
     """
     Retrieves the profile of the currently authenticated user by decoding JWT token.
     Only accessible with a valid Access Token in the Authorization header.
+    Recently seen users are served from an in-process cache without a query.
+    The user id is left in request.state for the access log.
     """
     if payload.get("token_type") != "access":
         raise InvalidTokenTypeException(expected_type="access")
@@ -28,19 +34,31 @@ async def get_current_user(
     if not email:
         raise InvalidTokenException()
 
-    query = select(UserModel).where(UserModel.email == email)
+    current_user = current_user_cache.get(email)
+    if current_user is not None:
+        request.state.user_id = current_user.id
+        return current_user
+
+    # Only the columns the endpoints rely on: ownership checks and admin access
+    query = select(UserModel.id, UserModel.email, UserModel.is_superuser).where(
+        UserModel.email == email
+    )
     result = await session.execute(query)
-    user_in_db = result.scalars().first()
+    user_in_db = result.first()
 
     if not user_in_db:
         raise UserNotFoundException()
 
-    return user_in_db
+    current_user = CurrentUser.model_validate(user_in_db)
+    current_user_cache.set(email, current_user)
+    request.state.user_id = current_user.id
+
+    return current_user
 
 
 async def admin_required(
-    current_user: UserModel = Depends(get_current_user),
-) -> UserModel:
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CurrentUser:
     """
     Checks if the authenticated user has the 'is_superuser' flag set to True.
     """
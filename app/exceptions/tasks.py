@@ -39,3 +39,21 @@ class TaskAlreadyCompletedException(AppException):
             message="Задача уже решена.",
             error_code="BAD REQUEST",
         )
+
+
+class InvalidCursorException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=400,
+            message="Некорректный курсор пагинации.",
+            error_code="BAD REQUEST",
+        )
+
+
+class BulkLimitExceededException(AppException):
+    def __init__(self, limit):
+        super().__init__(
+            status_code=422,
+            message=f"Слишком много задач в одном запросе (максимум {limit}).",
+            error_code="UNPROCESSABLE ENTITY",
+        )
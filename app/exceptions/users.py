@@ -38,3 +38,12 @@ class AdminAccessRequired(AppException):
             message="Запрещено: требуется доступ администратора.",
             error_code="FORBIDDEN",
         )
+
+
+class HashingOverloadedException(AppException):
+    def __init__(self):
+        super().__init__(
+            status_code=503,
+            message="Сервис перегружен, повторите попытку позже.",
+            error_code="SERVICE UNAVAILABLE",
+        )
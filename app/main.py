@@ -5,59 +5,95 @@ import sys
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 
-from app.api.endpoints import users, auth, tasks
+from app.api.endpoints import users, auth, tasks, metrics
 from app.exceptions.base import AppException
 
-from app.middlewares.logs import loguru_middleware
+from app.middlewares.logs import access_log_middleware, loguru_middleware
+from app.middlewares.metrics import metrics_middleware
+from app.middlewares.profiling import sql_profiling_middleware
+from app.db.database import engine, replica_router
+from app.db.profiling import install_sql_profiling
 from app.handlers.exceptions import app_exception_handler
 from app.handlers.validation_errors import validation_exception_handler
+from app.core.config import get_settings
+
+settings = get_settings()
 
 logger.remove()
 
-# Console logs
-logger.add(
-    sys.stderr,
-    level="DEBUG",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-    colorize=True,
-)
+if settings.LOG_MODE == "json":
+    # Access records are ready-made JSON; other records are serialized by loguru.
+    # enqueue=True leaves the writing to a background thread.
+    logger.add(
+        sys.stdout,
+        level=settings.LOG_LEVEL,
+        format="{message}",
+        filter=lambda record: "access" in record["extra"],
+        enqueue=True,
+    )
+    logger.add(
+        sys.stdout,
+        level=settings.LOG_LEVEL,
+        serialize=True,
+        filter=lambda record: "access" not in record["extra"],
+        enqueue=True,
+    )
+else:
+    # Console logs
+    logger.add(
+        sys.stderr,
+        level="DEBUG",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        colorize=True,
+    )
 
-# Different levels logs
-logger.add(
-    "logs/app.log",
-    level="INFO",
-    rotation="500 MB",
-    retention="10 days",
-    enqueue=True,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-)
-logger.add(
-    "logs/warnings.log",
-    level="WARNING",
-    rotation="10 MB",
-    retention="5 day",
-    enqueue=True,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-)
-logger.add(
-    "logs/errors.log",
-    level="ERROR",
-    rotation="10 MB",
-    retention="1 day",
-    enqueue=True,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-)
+    # Different levels logs
+    logger.add(
+        "logs/app.log",
+        level="INFO",
+        rotation="500 MB",
+        retention="10 days",
+        enqueue=True,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+    )
+    logger.add(
+        "logs/warnings.log",
+        level="WARNING",
+        rotation="10 MB",
+        retention="5 day",
+        enqueue=True,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+    )
+    logger.add(
+        "logs/errors.log",
+        level="ERROR",
+        rotation="10 MB",
+        retention="1 day",
+        enqueue=True,
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+    )
 
 
 app = FastAPI()
 
-app.middleware("http")(loguru_middleware)
+if settings.LOG_MODE == "json":
+    app.middleware("http")(access_log_middleware)
+else:
+    app.middleware("http")(loguru_middleware)
+if settings.METRICS_ENABLED:
+    app.middleware("http")(metrics_middleware)
+if settings.SQL_PROFILING_ENABLED:
+    for profiled_engine in (engine, *(r.engine for r in replica_router.replicas)):
+        install_sql_profiling(profiled_engine)
+    app.middleware("http")(sql_profiling_middleware)
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(tasks.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 
 @app.get("/")
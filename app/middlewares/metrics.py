@@ -0,0 +1,26 @@
+from fastapi import Request
+import time
+
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+
+async def metrics_middleware(request: Request, call_next):
+    """
+    Counts requests and observes their latency per route template,
+    so that the number of series does not grow with the ids in the paths.
+    """
+    start_time = time.perf_counter()
+    status = 500
+    HTTP_IN_FLIGHT.inc()
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+
+        route = request.scope.get("route")
+        path = route.path if route else "unmatched"
+        HTTP_REQUESTS.inc(request.method, path, status)
+        HTTP_LATENCY.observe(time.perf_counter() - start_time, request.method, path)
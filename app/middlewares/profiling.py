@@ -0,0 +1,72 @@
+import asyncio
+import random
+import time
+
+from fastapi import Request
+from loguru import logger
+
+from app.core.config import get_settings
+from app.db.database import engine
+from app.db.profiling import QueryProfile, current_profile
+
+settings = get_settings()
+
+# Running EXPLAIN tasks, referenced until they finish
+_explains: set[asyncio.Task] = set()
+
+
+async def explain(statement: str, parameters, elapsed: float, route: str):
+    """
+    Logs the plan of a slow statement. Runs on its own connection after the
+    response, so it neither delays the request nor touches its transaction.
+    """
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(str(row[0]) for row in result)
+        logger.warning(
+            f"Slow statement ({elapsed:.3f}s) in {route}:\n{statement}\n{plan}"
+        )
+    except Exception as e:
+        logger.warning(f"EXPLAIN of a slow statement in {route} failed: {e}")
+
+
+async def sql_profiling_middleware(request: Request, call_next):
+    """
+    Counts the SQL statements of a request and their total time, reports
+    them in the Server-Timing header and warns about requests with more than
+    SQL_PROFILING_MAX_QUERIES statements or with slow statements.
+    """
+    profile = QueryProfile()
+    token = current_profile.set(profile)
+    start_time = time.perf_counter()
+
+    try:
+        response = await call_next(request)
+    finally:
+        current_profile.reset(token)
+
+    total = time.perf_counter() - start_time
+    response.headers["Server-Timing"] = (
+        f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.queries} queries", '
+        f"total;dur={total * 1000:.1f}"
+    )
+
+    route = request.scope.get("route")
+    path = route.path if route else request.url.path
+
+    if profile.queries > settings.SQL_PROFILING_MAX_QUERIES:
+        logger.warning(
+            f"{request.method} {path} ran {profile.queries} SQL statements "
+            f"({profile.db_seconds:.3f}s)"
+        )
+
+    for statement, parameters, elapsed in profile.slow:
+        if random.random() < settings.SQL_PROFILING_EXPLAIN_SAMPLE_RATE:
+            task = asyncio.create_task(explain(statement, parameters, elapsed, path))
+            _explains.add(task)
+            task.add_done_callback(_explains.discard)
+        else:
+            logger.warning(f"Slow statement ({elapsed:.3f}s) in {path}:\n{statement}")
+
+    return response
@@ -1,12 +1,12 @@
-import bcrypt
 import datetime
 import jwt
 from jwt import PyJWTError
 
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import RevokedToken, User as UserModel
+from app.db.models import User as UserModel
 from app.exceptions.users import UserNotFoundException, InvalidCredentialsException
 from app.exceptions.tokens import (
     InvalidTokenException,
@@ -15,6 +15,8 @@ from app.exceptions.tokens import (
 )
 
 from app.core.security import create_access_token, create_refresh_token
+from app.core.hashing import password_hasher
+from app.core.denylist import get_token_denylist
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -37,8 +39,8 @@ class AuthService:
         if not user_in_db:
             raise UserNotFoundException()
 
-        if not bcrypt.checkpw(
-            user_in.password.encode("utf-8"), user_in_db.hashed_password.encode("utf-8")
+        if not await password_hasher.verify(
+            user_in.password, user_in_db.hashed_password
         ):
             raise InvalidCredentialsException()
 
@@ -62,33 +64,32 @@ class AuthService:
         if payload.get("token_type") != "refresh":
             raise InvalidTokenTypeException(expected_type="refresh")
 
-        # Check the unique token ID in the revoked token database
+        # Check the unique token ID in the denylist of revoked tokens
         jti = payload.get("jti")
+        denylist = get_token_denylist()
 
-        query = select(RevokedToken).where(RevokedToken.jti == jti)
-        result = await session.execute(query)
-        is_revoked = result.scalars().first()
-
-        if is_revoked:
+        if await denylist.is_revoked(jti, session):
             raise TokenRevokedException()
 
-        # Revoke the current refresh token and add it to the database
+        # Revoke the current refresh token; a concurrent refresh may have won the race
         expire_timestamp = payload.get("exp")
-        revoked_entry = RevokedToken(
-            jti=jti,
-            expires_at=datetime.datetime.fromtimestamp(
-                expire_timestamp, tz=datetime.UTC
-            ),
-        )
+        expires_at = datetime.datetime.fromtimestamp(expire_timestamp, tz=datetime.UTC)
 
-        session.add(revoked_entry)
+        if not await denylist.revoke(jti, expires_at, session):
+            raise TokenRevokedException()
 
         # Generate a new pair of tokens
         email = payload.get("sub")
         new_access = create_access_token({"sub": email})
         new_refresh = create_refresh_token({"sub": email})
 
-        await session.commit()
+        try:
+            await session.commit()
+        except IntegrityError:
+            # The JTI is already in revoked_tokens: revoked by a concurrent refresh,
+            # or missing from Redis (flushed, or written during a fallback to SQL)
+            await session.rollback()
+            raise TokenRevokedException()
 
         return {
             "access_token": new_access,
@@ -105,11 +106,8 @@ class AuthService:
             exp = payload.get("exp")
 
             # Add the refresh token to the blacklist
-            session.add(
-                RevokedToken(
-                    jti=jti,
-                    expires_at=datetime.datetime.fromtimestamp(exp, tz=datetime.UTC),
-                )
+            await get_token_denylist().revoke(
+                jti, datetime.datetime.fromtimestamp(exp, tz=datetime.UTC), session
             )
             await session.commit()
         except:
@@ -1,43 +1,226 @@
+import asyncio
 from datetime import datetime, timezone, timedelta
-from zoneinfo import ZoneInfo
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    Float,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert as pg_insert
+from sqlalchemy.orm import joinedload
+
+from loguru import logger
+from pydantic import ValidationError
 
+from app.db.models import NotificationOutbox, SEARCH_TS_CONFIG
+from app.db.models import TaskStats as TaskStatsModel
 from app.db.models import Task as TaskModel
 from app.db.models import User as UserModel
 from app.api.schemas.tasks import TaskCreate
+from app.api.schemas.users import CurrentUser
 from app.exceptions.tasks import (
     TaskNotFoundException,
     NotAuthorException,
     InvalidImportanceLevelException,
     TaskAlreadyCompletedException,
+    BulkLimitExceededException,
+)
+from app.utils.etag import page_etag, task_etag
+from app.utils.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
 )
 
-from app.utils.send_email import send_async_email
+from app.tasks.celery_app import celery_app
+from app.tasks.notification_email import send_task_notifications
 
 from app.core.config import get_settings
+from app.utils.timefmt import LOCAL_TZ
 from pathlib import Path
 
 TEMPLATE_FOLDER = Path(__file__).parent.parent / "templates"
 
 settings = get_settings()
-LOCAL_TZ = ZoneInfo(settings.TZ_IANA)
 LAST_WORK_HOUR = settings.LAST_HOUR
 
+# Loads only the author's email, which Task serialization needs for user_email
+AUTHOR_EMAIL = joinedload(TaskModel.user).load_only(UserModel.email)
+
+# Task columns sent to clients, i.e. without the search vector
+TASK_COLUMNS = tuple(
+    column for column in TaskModel.__table__.c if column.key != "search_vector"
+)
+
+# A task row with its author's email: the columns of list pages
+# and of UPDATE ... RETURNING, serialized without loading ORM objects
+TASK_ROW = (*TASK_COLUMNS, UserModel.email.label("user_email"))
+
+# What a removed or completed task contributed to task_stats
+STATS_RETURNING = (
+    TaskModel.id,
+    TaskModel.importance_level,
+    TaskModel.created_at,
+    TaskModel.completed_at,
+)
+
+LEVELS = ["A", "B", "C", "D"]
+
 
 class TaskService:
     @staticmethod
-    async def create_task(
-        task_data: TaskCreate,
-        current_user: UserModel,
-        session: AsyncSession,
-    ) -> TaskModel:
-        now_local = datetime.now(LOCAL_TZ)
+    async def _get_task(task_id: int, session: AsyncSession) -> TaskModel | None:
+        """
+        Selects a task together with its author's email. Also used instead of
+        session.refresh, which would expire the eagerly loaded author.
+        """
+        query = (
+            select(TaskModel)
+            .options(AUTHOR_EMAIL)
+            .where(TaskModel.id == task_id)
+            .execution_options(populate_existing=True)
+        )
+        result = await session.execute(query)
+        return result.scalars().first()
+
+    @staticmethod
+    async def _enqueue_notifications(outbox_ids: list[int]):
+        """
+        Hands committed outbox rows over to Celery without waiting for delivery.
+        Publishing blocks on the broker connection, so it runs in a thread
+        instead of the event loop. If the broker is unavailable, the rows
+        stay pending and relay_notification_outbox sends them later.
+        """
+        try:
+            await asyncio.to_thread(
+                celery_app.send_task,
+                send_task_notifications.name,
+                args=[outbox_ids],
+                retry=False,
+            )
+        except Exception as e:
+            logger.warning(f"Notifications {outbox_ids} left in the outbox: {e}")
+
+    @staticmethod
+    def _stats_change(task, sign: int = 1) -> tuple:
+        """
+        (importance_level, open, completed, completion seconds) that the task
+        adds to task_stats, or removes from them with sign=-1.
+        """
+        if task.completed_at is None:
+            return task.importance_level, sign, 0, 0.0
+
+        seconds = (task.completed_at - task.created_at).total_seconds()
+        return task.importance_level, 0, sign, sign * seconds
+
+    @staticmethod
+    async def _update_stats(user_id: int, changes: list[tuple], session: AsyncSession):
+        """
+        Adds the changes to the user's task_stats rows with one upsert,
+        in the caller's transaction.
+        """
+        deltas = {}
+        for level, opened, completed, seconds in changes:
+            delta = deltas.setdefault(level, [0, 0, 0.0])
+            delta[0] += opened
+            delta[1] += completed
+            delta[2] += seconds
+
+        if not deltas:
+            return
+
+        # Rows are always locked in the same order, so concurrent upserts cannot deadlock
+        query = pg_insert(TaskStatsModel).values(
+            [
+                {
+                    "user_id": user_id,
+                    "importance_level": level,
+                    "open_count": opened,
+                    "completed_count": completed,
+                    "completion_seconds": seconds,
+                }
+                for level, (opened, completed, seconds) in sorted(deltas.items())
+            ]
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[TaskStatsModel.user_id, TaskStatsModel.importance_level],
+            set_={
+                "open_count": TaskStatsModel.open_count + query.excluded.open_count,
+                "completed_count": TaskStatsModel.completed_count
+                + query.excluded.completed_count,
+                "completion_seconds": TaskStatsModel.completion_seconds
+                + query.excluded.completion_seconds,
+            },
+        )
+        await session.execute(query)
+
+    @staticmethod
+    def _page_query(query, limit: int, cursor: str | None):
+        """
+        Keyset pagination over (created_at, id), newest first: restricts
+        `query` to the page after `cursor` plus one row that tells whether
+        there is a next page. Every page is a bounded index range scan
+        regardless of its depth.
+        """
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(TaskModel.created_at, TaskModel.id) < (created_at, task_id)
+            )
+
+        return query.order_by(TaskModel.created_at.desc(), TaskModel.id.desc()).limit(
+            limit + 1
+        )
+
+    @staticmethod
+    async def _paginate(
+        query, limit: int, cursor: str | None, session: AsyncSession
+    ) -> dict:
+        limit = max(1, min(limit, settings.TASKS_PAGE_SIZE_MAX))
+
+        query = query.with_only_columns(*TASK_ROW).join_from(
+            TaskModel, UserModel, UserModel.id == TaskModel.user_id
+        )
+        result = await session.execute(TaskService._page_query(query, limit, cursor))
+        tasks = result.all()
+
+        etag = page_etag([(task.id, task.updated_at) for task in tasks], limit)
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+
+        return {"items": tasks, "next_cursor": next_cursor, "etag": etag}
+
+    @staticmethod
+    async def _page_etag(
+        query, limit: int, cursor: str | None, session: AsyncSession
+    ) -> str:
+        """
+        ETag of the page _paginate would return, from a query that reads
+        only the (id, updated_at) version columns of its rows.
+        """
+        limit = max(1, min(limit, settings.TASKS_PAGE_SIZE_MAX))
 
-        level = task_data.importance_level
-        deadline = None
+        query = query.with_only_columns(TaskModel.id, TaskModel.updated_at)
+        result = await session.execute(TaskService._page_query(query, limit, cursor))
 
+        return page_etag(result.all(), limit)
+
+    @staticmethod
+    def _deadline(level: str, now_local: datetime) -> datetime:
+        """
+        Deadline of a task created at `now_local`, depending on its importance level.
+        """
         if level == "A":
             deadline = now_local.replace(
                 hour=LAST_WORK_HOUR, minute=0, second=0, microsecond=0
@@ -52,27 +235,232 @@ class TaskService:
         else:
             deadline = now_local + timedelta(days=30)
 
+        return deadline
+
+    @staticmethod
+    async def create_task(
+        task_data: TaskCreate,
+        current_user: CurrentUser,
+        session: AsyncSession,
+    ) -> TaskModel:
+        deadline = TaskService._deadline(
+            task_data.importance_level, datetime.now(LOCAL_TZ)
+        )
+
         new_task = TaskModel(
             **task_data.model_dump(), user_id=current_user.id, deadline_date=deadline
         )
 
-        session.add(new_task)
+        outbox = NotificationOutbox(task=new_task, template="task_notification.html")
+
+        session.add_all([new_task, outbox])
+        await TaskService._update_stats(
+            current_user.id, [TaskService._stats_change(new_task)], session
+        )
         await session.commit()
-        await session.refresh(new_task)
 
-        await send_async_email(new_task, "task_notification.html")
+        await TaskService._enqueue_notifications([outbox.id])
 
-        return new_task
+        return await TaskService._get_task(new_task.id, session)
 
     @staticmethod
-    async def get_all_tasks(
-        level: str, completed: bool, current_user: UserModel, session: AsyncSession
-    ):
+    async def create_tasks_bulk(
+        items: list, current_user: CurrentUser, session: AsyncSession
+    ) -> dict:
+        """
+        Creates many tasks with one multi-row INSERT ... RETURNING.
+        Items are validated one by one: invalid ones are reported by their index
+        and do not prevent the valid ones from being created.
+        """
+        if len(items) > settings.TASKS_BULK_MAX_ITEMS:
+            raise BulkLimitExceededException(settings.TASKS_BULK_MAX_ITEMS)
+
+        now_local = datetime.now(LOCAL_TZ)
+        results = []
+        rows = []
+        row_indexes = []
+
+        for index, item in enumerate(items):
+            try:
+                task_data = TaskCreate.model_validate(item)
+            except ValidationError as e:
+                errors = [
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in e.errors(include_url=False)
+                ]
+                results.append({"index": index, "errors": errors})
+                continue
+
+            deadline = TaskService._deadline(task_data.importance_level, now_local)
+            rows.append(
+                {
+                    **task_data.model_dump(),
+                    "user_id": current_user.id,
+                    "deadline_date": deadline,
+                }
+            )
+            row_indexes.append(index)
+
+        if rows:
+            result = await session.execute(
+                insert(TaskModel).returning(
+                    *TASK_COLUMNS, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            created = result.all()
+            tasks = [
+                {**task._mapping, "user_email": current_user.email} for task in created
+            ]
+
+            result = await session.execute(
+                insert(NotificationOutbox).returning(NotificationOutbox.id),
+                [
+                    {"task_id": task["id"], "template": "task_notification.html"}
+                    for task in tasks
+                ],
+            )
+            outbox_ids = result.scalars().all()
+
+            await TaskService._update_stats(
+                current_user.id,
+                [TaskService._stats_change(task) for task in created],
+                session,
+            )
+            await session.commit()
+
+            await TaskService._enqueue_notifications(outbox_ids)
+
+            results.extend(
+                {"index": index, "task": task}
+                for index, task in zip(row_indexes, tasks)
+            )
+            results.sort(key=lambda item: item["index"])
+
+        return {
+            "created": len(rows),
+            "failed": len(items) - len(rows),
+            "results": results,
+        }
+
+    @staticmethod
+    async def _bulk_change_result(
+        ids: list[int],
+        changed_ids: list[int],
+        current_user: CurrentUser,
+        session: AsyncSession,
+    ) -> dict:
+        """
+        Sorts the ids a bulk change did not apply to by the reason,
+        with one query over the unchanged ids only.
+        """
+        summary = {
+            "succeeded": sorted(changed_ids),
+            "not_found": [],
+            "not_owned": [],
+            "already_completed": [],
+        }
+        unchanged_ids = set(ids) - set(changed_ids)
+        if not unchanged_ids:
+            return summary
+
+        query = select(TaskModel.id, TaskModel.user_id).where(
+            TaskModel.id.in_(unchanged_ids)
+        )
+        result = await session.execute(query)
+        owners = {task.id: task.user_id for task in result.all()}
+
+        for task_id in sorted(unchanged_ids):
+            if task_id not in owners:
+                summary["not_found"].append(task_id)
+            elif owners[task_id] != current_user.id:
+                summary["not_owned"].append(task_id)
+            else:
+                summary["already_completed"].append(task_id)
+
+        return summary
+
+    @staticmethod
+    def _check_bulk_ids(ids: list[int]) -> list[int]:
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > settings.TASKS_BULK_MAX_ITEMS:
+            raise BulkLimitExceededException(settings.TASKS_BULK_MAX_ITEMS)
+        return ids
+
+    @staticmethod
+    async def complete_tasks_bulk(
+        ids: list[int], current_user: CurrentUser, session: AsyncSession
+    ) -> dict:
+        """
+        Completes the caller's open tasks among `ids` with one UPDATE.
+        """
+        ids = TaskService._check_bulk_ids(ids)
+        completion_time = datetime.now(timezone.utc)
+
+        query = (
+            update(TaskModel)
+            .where(
+                TaskModel.id.in_(ids),
+                TaskModel.user_id == current_user.id,
+                TaskModel.completed_at.is_(None),
+            )
+            .values(completed_at=completion_time)
+            .returning(*STATS_RETURNING)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(query)
+        completed = result.all()
+
+        changes = []
+        for task in completed:
+            changes.append((task.importance_level, -1, 0, 0.0))
+            changes.append(TaskService._stats_change(task))
+        await TaskService._update_stats(current_user.id, changes, session)
+
+        summary = await TaskService._bulk_change_result(
+            ids, [task.id for task in completed], current_user, session
+        )
+        await session.commit()
+
+        return summary
+
+    @staticmethod
+    async def delete_tasks_bulk(
+        ids: list[int], current_user: CurrentUser, session: AsyncSession
+    ) -> dict:
+        """
+        Deletes the caller's tasks among `ids` with one DELETE.
+        """
+        ids = TaskService._check_bulk_ids(ids)
+
+        query = (
+            delete(TaskModel)
+            .where(TaskModel.id.in_(ids), TaskModel.user_id == current_user.id)
+            .returning(*STATS_RETURNING)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(query)
+        deleted = result.all()
+
+        await TaskService._update_stats(
+            current_user.id,
+            [TaskService._stats_change(task, -1) for task in deleted],
+            session,
+        )
+
+        summary = await TaskService._bulk_change_result(
+            ids, [task.id for task in deleted], current_user, session
+        )
+        await session.commit()
+
+        return summary
+
+    @staticmethod
+    def _all_tasks_query(level: str, completed: bool):
         query = select(TaskModel)
 
         if level:
-            levels = ["A", "B", "C", "D"]
-            if level not in levels:
+            if level not in LEVELS:
                 raise InvalidImportanceLevelException()
 
             query = query.where(TaskModel.importance_level == level)
@@ -82,16 +470,78 @@ class TaskService:
         elif completed is False:
             query = query.where(TaskModel.completed_at.is_(None))
 
-        result = await session.execute(query)
-        return result.scalars().all()
+        return query
+
+    @staticmethod
+    async def get_all_tasks(
+        level: str,
+        completed: bool,
+        limit: int,
+        cursor: str | None,
+        current_user: CurrentUser,
+        session: AsyncSession,
+    ):
+        query = TaskService._all_tasks_query(level, completed)
+
+        return await TaskService._paginate(query, limit, cursor, session)
+
+    @staticmethod
+    async def get_all_tasks_etag(
+        level: str,
+        completed: bool,
+        limit: int,
+        cursor: str | None,
+        session: AsyncSession,
+    ) -> str:
+        query = TaskService._all_tasks_query(level, completed)
+
+        return await TaskService._page_etag(query, limit, cursor, session)
+
+    @staticmethod
+    async def search_tasks(
+        q: str,
+        limit: int,
+        cursor: str | None,
+        current_user: CurrentUser,
+        session: AsyncSession,
+    ) -> dict:
+        """
+        Full-text search over task titles and contents, best matches first.
+        Matches come from the GIN index on search_vector; pages are keyset
+        over (rank, id), like _paginate over (created_at, id).
+        """
+        limit = max(1, min(limit, settings.TASKS_PAGE_SIZE_MAX))
+
+        ts_config = cast(literal(SEARCH_TS_CONFIG), REGCONFIG)
+        ts_query = func.websearch_to_tsquery(ts_config, q)
+        rank = func.ts_rank(TaskModel.search_vector, ts_query, type_=Float)
+
+        query = (
+            select(*TASK_ROW, rank.label("rank"))
+            .join_from(TaskModel, UserModel, UserModel.id == TaskModel.user_id)
+            .where(TaskModel.search_vector.bool_op("@@")(ts_query))
+        )
+
+        if cursor:
+            last_rank, task_id = decode_rank_cursor(cursor)
+            query = query.where(tuple_(rank, TaskModel.id) < (last_rank, task_id))
+
+        query = query.order_by(rank.desc(), TaskModel.id.desc())
+        result = await session.execute(query.limit(limit + 1))
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+
+        return {"items": rows, "next_cursor": next_cursor}
 
     @staticmethod
     async def get_task_by_id(
-        task_id: int, current_user: UserModel, session: AsyncSession
+        task_id: int, current_user: CurrentUser, session: AsyncSession
     ):
-        query = select(TaskModel).where(TaskModel.id == task_id)
-        result = await session.execute(query)
-        task_in_db = result.scalars().first()
+        task_in_db = await TaskService._get_task(task_id, session)
 
         if not task_in_db:
             raise TaskNotFoundException(task_id)
@@ -99,91 +549,221 @@ class TaskService:
         return task_in_db
 
     @staticmethod
-    async def get_my_tasks(current_user: UserModel, session: AsyncSession):
-        query = select(TaskModel).where(TaskModel.user_id == current_user.id)
+    async def get_task_etag(task_id: int, session: AsyncSession) -> str | None:
+        """
+        ETag of a task from its version columns only, None if there is no such task.
+        """
+        query = select(TaskModel.id, TaskModel.updated_at).where(
+            TaskModel.id == task_id
+        )
         result = await session.execute(query)
+        task = result.first()
 
-        return result.scalars().all()
+        return task_etag(task) if task else None
 
     @staticmethod
-    async def update_task(
-        task_id: int, task_update, current_user: UserModel, session: AsyncSession
+    async def get_my_tasks(
+        limit: int, cursor: str | None, current_user: CurrentUser, session: AsyncSession
     ):
-        query = select(TaskModel).where(TaskModel.id == task_id)
+        query = select(TaskModel).where(TaskModel.user_id == current_user.id)
+
+        return await TaskService._paginate(query, limit, cursor, session)
+
+    @staticmethod
+    async def get_my_tasks_etag(
+        limit: int, cursor: str | None, current_user: CurrentUser, session: AsyncSession
+    ) -> str:
+        query = select(TaskModel).where(TaskModel.user_id == current_user.id)
+
+        return await TaskService._page_etag(query, limit, cursor, session)
+
+    @staticmethod
+    async def _raise_for_missing(
+        task_id: int, owner: CurrentUser | None, session: AsyncSession
+    ):
+        """
+        Explains why a guarded mutation matched no rows.
+        Only runs on the failure path, the successful one is a single statement.
+        """
+        query = select(TaskModel.user_id).where(TaskModel.id == task_id)
         result = await session.execute(query)
-        task_in_db = result.scalars().first()
+        task = result.first()
 
-        if not task_in_db:
+        if not task:
             raise TaskNotFoundException(task_id)
 
-        if task_in_db.user_email != current_user.email:
+        if owner is not None and task.user_id != owner.id:
             raise NotAuthorException()
 
-        if task_update.content:
-            task_in_db.content = task_update.content
-
-        await session.commit()
-        await session.refresh(task_in_db)
-
-        return task_in_db
+        raise TaskAlreadyCompletedException()
 
     @staticmethod
-    async def complete_task(
-        task_id: int, current_user: UserModel, session: AsyncSession
+    async def _update_task(
+        task_id: int,
+        values: dict,
+        session: AsyncSession,
+        owner: CurrentUser | None = None,
+        open_only: bool = False,
     ):
-        query = select(TaskModel).where(TaskModel.id == task_id)
+        """
+        Applies `values` with one UPDATE ... RETURNING that carries the ownership
+        (and, for open_only, the not-completed) check in its WHERE clause.
+        Returns the updated row together with the author's email.
+        The caller commits.
+        """
+        query = update(TaskModel).where(
+            TaskModel.id == task_id, UserModel.id == TaskModel.user_id
+        )
+        if owner is not None:
+            query = query.where(TaskModel.user_id == owner.id)
+        if open_only:
+            query = query.where(TaskModel.completed_at.is_(None))
+
+        query = (
+            query.values(**values)
+            .returning(*TASK_ROW)
+            .execution_options(synchronize_session=False)
+        )
         result = await session.execute(query)
-        task_in_db = result.scalars().first()
+        task = result.first()
 
-        if not task_in_db:
-            raise TaskNotFoundException(task_id)
+        if not task:
+            await session.rollback()
+            await TaskService._raise_for_missing(task_id, owner, session)
 
-        if task_in_db.user_email != current_user.email:
-            raise NotAuthorException()
+        return task
+
+    @staticmethod
+    async def update_task(
+        task_id: int, task_update, current_user: CurrentUser, session: AsyncSession
+    ):
+        if task_update.content:
+            values = {"content": task_update.content}
+        else:
+            # Nothing to change: still checks the author, keeps updated_at as is
+            values = {"updated_at": TaskModel.updated_at}
+
+        task = await TaskService._update_task(
+            task_id, values, session, owner=current_user
+        )
+        await session.commit()
 
-        if task_in_db.completed_at:
-            raise TaskAlreadyCompletedException()
+        return task
 
+    @staticmethod
+    async def complete_task(
+        task_id: int, current_user: CurrentUser, session: AsyncSession
+    ):
         completion_time = datetime.now(timezone.utc)
-        task_in_db.completed_at = completion_time
 
+        task = await TaskService._update_task(
+            task_id,
+            {"completed_at": completion_time},
+            session,
+            owner=current_user,
+            open_only=True,
+        )
+        changes = [(task.importance_level, -1, 0, 0.0), TaskService._stats_change(task)]
+        await TaskService._update_stats(task.user_id, changes, session)
         await session.commit()
-        await session.refresh(task_in_db)
 
-        return task_in_db
+        return task
 
     @staticmethod
     async def create_remark(task_id: int, task_remark, session: AsyncSession):
-        query = select(TaskModel).where(TaskModel.id == task_id)
-        result = await session.execute(query)
-        task = result.scalars().first()
-
-        if not task:
-            raise TaskNotFoundException(task_id)
-
         if task_remark.remark:
-            task.remark = task_remark.remark
+            values = {"remark": task_remark.remark}
+        else:
+            values = {"updated_at": TaskModel.updated_at}
 
+        task = await TaskService._update_task(task_id, values, session)
         await session.commit()
-        await session.refresh(task)
 
         return task
 
     @staticmethod
     async def delete_task(
-        task_id: int, current_user: UserModel, session: AsyncSession
+        task_id: int, current_user: CurrentUser, session: AsyncSession
     ) -> dict:
-        query = select(TaskModel).where(TaskModel.id == task_id)
+        query = (
+            delete(TaskModel)
+            .where(TaskModel.id == task_id, TaskModel.user_id == current_user.id)
+            .returning(*STATS_RETURNING)
+            .execution_options(synchronize_session=False)
+        )
         result = await session.execute(query)
-        task_in_db = result.scalars().first()
+        task = result.first()
 
-        if not task_in_db:
-            raise TaskNotFoundException(task_id)
-
-        if current_user.email != task_in_db.user_email:
-            raise NotAuthorException()
+        if not task:
+            await session.rollback()
+            await TaskService._raise_for_missing(task_id, current_user, session)
 
-        await session.delete(task_in_db)
+        await TaskService._update_stats(
+            current_user.id, [TaskService._stats_change(task, -1)], session
+        )
         await session.commit()
 
         return {"message": f"Задача с id = {task_id} успешно удалена."}
+
+    @staticmethod
+    async def get_task_stats(user_id: int | None, session: AsyncSession) -> dict:
+        """
+        Open, completed and overdue task counts per importance level and
+        the average completion time, for one user or, with user_id=None, for all.
+        Counters come from task_stats; overdue tasks are counted over the
+        partial index of open tasks, as they depend on the current time.
+        """
+        counters = select(
+            TaskStatsModel.importance_level,
+            func.sum(TaskStatsModel.open_count).label("open"),
+            func.sum(TaskStatsModel.completed_count).label("completed"),
+            func.sum(TaskStatsModel.completion_seconds).label("seconds"),
+        ).group_by(TaskStatsModel.importance_level)
+
+        overdue = (
+            select(TaskModel.importance_level, func.count().label("overdue"))
+            .where(
+                TaskModel.completed_at.is_(None),
+                TaskModel.deadline_date < func.now(),
+            )
+            .group_by(TaskModel.importance_level)
+        )
+
+        if user_id is not None:
+            counters = counters.where(TaskStatsModel.user_id == user_id)
+            overdue = overdue.where(TaskModel.user_id == user_id)
+
+        result = await session.execute(counters)
+        counter_rows = {row.importance_level: row for row in result.all()}
+        result = await session.execute(overdue)
+        overdue_counts = dict(result.tuples().all())
+
+        levels = {}
+        total = {"open": 0, "completed": 0, "overdue": 0, "seconds": 0.0}
+        for level in LEVELS:
+            row = counter_rows.get(level)
+            stats = {
+                "open": row.open if row else 0,
+                "completed": row.completed if row else 0,
+                "overdue": overdue_counts.get(level, 0),
+                "seconds": row.seconds if row else 0.0,
+            }
+            for key in total:
+                total[key] += stats[key]
+            levels[level] = stats
+
+        def summary(stats: dict) -> dict:
+            completed = stats["completed"]
+            return {
+                "open": stats["open"],
+                "completed": completed,
+                "overdue": stats["overdue"],
+                "avg_completion_seconds": stats["seconds"] / completed
+                if completed
+                else None,
+            }
+
+        return {
+            "levels": {level: summary(stats) for level, stats in levels.items()},
+            "total": summary(total),
+        }
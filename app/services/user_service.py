@@ -1,13 +1,15 @@
-import bcrypt
-from sqlalchemy import select, or_
+from sqlalchemy import func, select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import User as UserModel
+from app.core.hashing import password_hasher
 from app.exceptions.users import (
     EmailAlreadyExistsException,
     PhoneAlreadyExistsException,
     UserNotFoundException,
 )
+from app.utils.cache import current_user_cache
+from app.utils.etag import make_etag
 
 
 class UserService:
@@ -25,12 +27,11 @@ class UserService:
             if existing_user.phone == user.phone:
                 raise PhoneAlreadyExistsException(phone=user.phone)
 
-        password_bytes = bytes(user.password, "utf-8")
-        hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+        hashed_password = await password_hasher.hash(user.password)
 
         new_user = UserModel(
             name=user.name,
-            hashed_password=hashed.decode("utf-8"),
+            hashed_password=hashed_password,
             position=user.position,
             email=user.email,
             phone=user.phone,
@@ -49,6 +50,26 @@ class UserService:
 
         return result.scalars().all()
 
+    @staticmethod
+    async def get_users_etag(session: AsyncSession) -> str:
+        """
+        ETag of the user list. Users are never modified after signup and
+        ids only grow, so the count and the largest id identify the list.
+        """
+        query = select(func.count(), func.max(UserModel.id))
+        result = await session.execute(query)
+        count, max_id = result.one()
+
+        return make_etag(count, max_id)
+
+    @staticmethod
+    async def get_user_etag(user_id: int, session: AsyncSession) -> str | None:
+        query = select(UserModel.id).where(UserModel.id == user_id)
+        result = await session.execute(query)
+        user_id = result.scalar()
+
+        return make_etag(user_id) if user_id else None
+
     @staticmethod
     async def get_user_by_id(user_id: int, session: AsyncSession):
         query = select(UserModel).where(UserModel.id == user_id)
@@ -76,4 +97,7 @@ class UserService:
         await session.delete(user_in_db)
         await session.commit()
 
+        # Tokens of the deleted user must stop authenticating in this process
+        current_user_cache.invalidate(user_in_db.email)
+
         return {"message": f"Пользователь с id = {user_id} успешно удален."}
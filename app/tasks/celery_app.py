@@ -1,12 +1,15 @@
-from zoneinfo import ZoneInfo
 from celery import Celery
 from celery.schedules import crontab
+from . import metrics  # noqa: F401  (job metrics signal handlers)
 from .revoked_token_task import cleanup_expired_tokens
 from .notification_email import (
+    DIGEST,
     send_uncompleted_task_notification,
     send_delayed_task_notification,
+    relay_notification_outbox,
 )
 from app.core.config import get_settings
+from app.utils.timefmt import LOCAL_TZ
 
 settings = get_settings()
 
@@ -17,7 +20,6 @@ Redis is used as:
 - a message broker for task distribution between the application and workers;
 - a backendfor storing results, which keeps track of task execution status.
 """
-LOCAL_TZ = ZoneInfo(settings.TZ_IANA)
 LAST_WORK_HOUR = settings.LAST_HOUR
 
 celery_app = Celery("worker", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
@@ -33,11 +35,16 @@ celery_app.conf.beat_schedule = {
     "send_uncompleted_notification": {
         "task": send_uncompleted_task_notification.name,
         "schedule": crontab(hour="*/2", minute=0),  # Launch every 2 hours
+        "kwargs": {"mode": DIGEST},  # One letter per recipient
     },
     "send_delayed_notification": {
         "task": send_delayed_task_notification.name,
         "schedule": crontab(hour=LAST_WORK_HOUR, minute=0),
     },
+    "relay_notification_outbox": {
+        "task": relay_notification_outbox.name,
+        "schedule": crontab(minute="*"),  # Launch every minute
+    },
 }
 
 # Launch in two terminals
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from bisect import bisect_left
+
+import redis
+import redis.asyncio as aioredis
+from celery.signals import task_prerun, task_postrun
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.metrics import EMAILS_SENT, LATENCY_BUCKETS, render_histogram
+
+settings = get_settings()
+
+# Celery job metrics. Every worker process adds its job durations and sent
+# letters to one Redis hash when a job finishes; GET /metrics of the API
+# renders the totals. Fields of the hash:
+# - runs|<task>|<state>           finished jobs;
+# - duration|<task>|<bucket>      jobs per LATENCY_BUCKETS bucket (not cumulative);
+# - duration_sum|<task>           total seconds;
+# - emails_sent                   letters accepted by SMTP.
+JOB_METRICS_KEY = "metrics:celery"
+
+_started: dict[str, float] = {}
+_emails_reported = 0
+_client: redis.Redis | None = None
+_async_client: aioredis.Redis | None = None
+
+
+@task_prerun.connect
+def job_started(task_id=None, **kwargs):
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def job_finished(task_id=None, task=None, state=None, **kwargs):
+    global _client, _emails_reported
+
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+
+    duration = time.perf_counter() - started
+    emails = EMAILS_SENT.value()
+
+    try:
+        if _client is None:
+            _client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=settings.METRICS_REDIS_TIMEOUT_SECONDS,
+                socket_timeout=settings.METRICS_REDIS_TIMEOUT_SECONDS,
+            )
+
+        bucket = bisect_left(LATENCY_BUCKETS, duration)
+        pipe = _client.pipeline(transaction=False)
+        pipe.hincrby(JOB_METRICS_KEY, f"runs|{task.name}|{state}", 1)
+        pipe.hincrby(JOB_METRICS_KEY, f"duration|{task.name}|{bucket}", 1)
+        pipe.hincrbyfloat(JOB_METRICS_KEY, f"duration_sum|{task.name}", duration)
+        if emails > _emails_reported:
+            pipe.hincrby(JOB_METRICS_KEY, "emails_sent", int(emails - _emails_reported))
+        pipe.execute()
+
+        _emails_reported = emails
+    except RedisError as e:
+        print(f"Job metrics of {task.name} were not recorded: {e}")
+
+
+async def render_job_metrics() -> list[str]:
+    """
+    Exposition lines of the Celery job metrics accumulated in Redis.
+    Missing from the scrape if Redis does not answer within
+    METRICS_REDIS_TIMEOUT_SECONDS, so scrapes do not pile up on the API.
+    """
+    global _async_client
+
+    timeout = settings.METRICS_REDIS_TIMEOUT_SECONDS
+    try:
+        if _async_client is None:
+            _async_client = aioredis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=timeout,
+                socket_timeout=timeout,
+            )
+        fields = await asyncio.wait_for(_async_client.hgetall(JOB_METRICS_KEY), timeout)
+    except (RedisError, TimeoutError) as e:
+        logger.warning(f"Celery job metrics are unavailable: {e!r}")
+        return []
+
+    runs = {}
+    counts = {}
+    sums = {}
+    emails_sent = 0
+    for field, value in fields.items():
+        kind, *rest = field.decode().split("|")
+        if kind == "runs":
+            runs[tuple(rest)] = int(value)
+        elif kind == "duration":
+            task_name, bucket = rest
+            task_counts = counts.setdefault(task_name, [0] * (len(LATENCY_BUCKETS) + 1))
+            task_counts[int(bucket)] = int(value)
+        elif kind == "duration_sum":
+            sums[rest[0]] = float(value)
+        elif kind == "emails_sent":
+            emails_sent = int(value)
+
+    lines = [
+        "# HELP celery_jobs_total Finished Celery jobs.",
+        "# TYPE celery_jobs_total counter",
+    ]
+    for (task_name, state), value in sorted(runs.items()):
+        lines.append(f'celery_jobs_total{{task="{task_name}",state="{state}"}} {value}')
+
+    lines += [
+        "# HELP celery_job_duration_seconds Celery job duration.",
+        "# TYPE celery_job_duration_seconds histogram",
+    ]
+    for task_name, task_counts in sorted(counts.items()):
+        lines.extend(
+            render_histogram(
+                "celery_job_duration_seconds",
+                ("task",),
+                (task_name,),
+                LATENCY_BUCKETS,
+                task_counts,
+                sums.get(task_name, 0.0),
+            )
+        )
+
+    lines += [
+        "# HELP celery_emails_sent_total Letters accepted by SMTP.",
+        "# TYPE celery_emails_sent_total counter",
+        f"celery_emails_sent_total {emails_sent}",
+    ]
+    return lines
@@ -1,40 +1,179 @@
 from asgiref.sync import async_to_sync
 from celery import shared_task
-from sqlalchemy import select
-from zoneinfo import ZoneInfo
-from datetime import datetime
+from sqlalchemy import select, update, func, literal, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta, timezone
 from app.db.database import AsyncSessionLocal
-from app.db.models import Task
+from app.db.models import NotificationOutbox, Task, User
 
 from app.core.config import get_settings
-from app.utils.send_email import send_async_email
+from app.utils.timefmt import LOCAL_TZ
+from app.utils.mail_sender import MailSender
+from app.utils.send_email import (
+    build_task_message,
+    build_task_messages,
+    build_digest_messages,
+)
 from pathlib import Path
 
 settings = get_settings()
 
 TEMPLATE_FOLDER = Path(__file__).parent.parent / "templates"
 
-LOCAL_TZ = ZoneInfo(settings.TZ_IANA)
 
+# Rendered inline so the planner can match the partial indexes on tasks
+LEVEL_A = literal("A", literal_execute=True)
 
-async def uncompleted_task_email():
+# Recipient address for build_task_message (task.user_email)
+AUTHOR_EMAIL = joinedload(Task.user).load_only(User.email)
+
+# Notification modes, selected per job with "kwargs" in celery_app.beat_schedule:
+# one letter per task, or one digest letter per recipient listing all their tasks
+PER_TASK = "per_task"
+DIGEST = "digest"
+
+REMINDER_TEMPLATES = {PER_TASK: "task_notification.html", DIGEST: "task_digest.html"}
+OVERDUE_TEMPLATES = {PER_TASK: "delay_notification.html", DIGEST: "delay_digest.html"}
+
+
+def open_level_a(*criteria) -> tuple:
+    return (Task.importance_level == LEVEL_A, Task.completed_at.is_(None), *criteria)
+
+
+async def iter_task_batches(session, criteria):
+    """
+    Yields the tasks matching `criteria` in (deadline_date, id) order,
+    NOTIFICATION_BATCH_SIZE at a time. Every batch is a separate short
+    keyset query, so the caller may commit between batches and memory
+    stays bounded by one batch.
+    """
+    query = (
+        select(Task)
+        .options(AUTHOR_EMAIL)
+        .where(*criteria)
+        .order_by(Task.deadline_date, Task.id)
+    )
+    position = None
+
+    while True:
+        batch_query = query
+        if position:
+            batch_query = query.where(tuple_(Task.deadline_date, Task.id) > position)
+
+        result = await session.execute(
+            batch_query.limit(settings.NOTIFICATION_BATCH_SIZE)
+        )
+        tasks = result.scalars().all()
+        if not tasks:
+            return
+
+        yield tasks
+
+        position = (tasks[-1].deadline_date, tasks[-1].id)
+        session.expunge_all()
+
+
+async def iter_digest_batches(session, criteria):
+    """
+    Yields (user_id, email, tasks) rows with the tasks matching `criteria`
+    grouped per author in SQL, NOTIFICATION_BATCH_SIZE recipients at a time.
+    Every batch first takes the next recipients in user_id order, then
+    aggregates only their tasks, so a batch does not group the remaining ones.
+    """
+    # Keys are rendered inline: json_build_object cannot infer bound parameter types
+    fields = {
+        "id": Task.id,
+        "title": Task.title,
+        "content": Task.content,
+        "deadline": Task.deadline_date,
+    }
+    task_json = func.json_build_object(
+        *(
+            arg
+            for key, column in fields.items()
+            for arg in (literal_column(f"'{key}'"), column)
+        )
+    )
+    tasks = func.json_agg(
+        aggregate_order_by(task_json, Task.deadline_date, Task.id), type_=JSON
+    )
+    recipients = (
+        select(Task.user_id)
+        .where(*criteria)
+        .distinct()
+        .order_by(Task.user_id)
+        .limit(settings.NOTIFICATION_BATCH_SIZE)
+    )
+    query = (
+        select(Task.user_id, User.email, tasks.label("tasks"))
+        .join(User, User.id == Task.user_id)
+        .where(*criteria)
+        .group_by(Task.user_id, User.email)
+        .order_by(Task.user_id)
+    )
+    last_user_id = 0
+
+    while True:
+        result = await session.execute(recipients.where(Task.user_id > last_user_id))
+        user_ids = result.scalars().all()
+        if not user_ids:
+            return
+
+        result = await session.execute(query.where(Task.user_id.in_(user_ids)))
+        rows = result.all()
+        # Empty if all their tasks were completed in between
+        if rows:
+            yield rows
+
+        last_user_id = user_ids[-1]
+
+
+async def iter_notification_batches(session, criteria, mode: str, template: str):
+    """
+    Yields batches of (message, ids of the tasks it covers) pairs:
+    one message per task, or in DIGEST mode one per recipient.
+    """
+    if mode == DIGEST:
+        async for rows in iter_digest_batches(session, criteria):
+            messages = build_digest_messages(rows, template)
+            task_ids = [[task["id"] for task in row.tasks] for row in rows]
+            yield list(zip(messages, task_ids))
+    else:
+        async for tasks in iter_task_batches(session, criteria):
+            messages = build_task_messages(tasks, template)
+            yield [(message, [task.id]) for message, task in zip(messages, tasks)]
+
+
+def sent_task_ids(batch, errors) -> list[int]:
+    """
+    Reports failed deliveries and returns the ids of the tasks that were sent.
+    """
+    sent_ids = []
+    for (message, task_ids), error in zip(batch, errors):
+        if error:
+            print(f"Error during sending to {message['To']}: {error}")
+        else:
+            sent_ids.extend(task_ids)
+    return sent_ids
+
+
+async def uncompleted_task_email(mode: str = PER_TASK):
     """
     Sends a reminder about a level A task. Works for tasks before the deadline.
     """
     session = AsyncSessionLocal()
     now_local = datetime.now(LOCAL_TZ)
     try:
-        query = (
-            select(Task)
-            .where(Task.importance_level == "A")
-            .where(Task.completed_at.is_(None))
-            .where(Task.deadline_date > now_local)
-        )
-        result = await session.execute(query)
-        tasks = result.scalars().all()
+        template = REMINDER_TEMPLATES[mode]
+        criteria = open_level_a(Task.deadline_date > now_local)
 
-        for task in tasks:
-            await send_async_email(task, "task_notification.html")
+        async with MailSender() as sender:
+            async for batch in iter_notification_batches(
+                session, criteria, mode, template
+            ):
+                errors = await sender.send_many([message for message, _ in batch])
+                sent_task_ids(batch, errors)
     except Exception as e:
         await session.rollback()
         print(f"Error during sending: {e}")
@@ -42,28 +181,35 @@ async def uncompleted_task_email():
         await session.close()
 
 
-async def delayed_task_email():
+async def delayed_task_email(mode: str = PER_TASK):
     """
     Sends a one-time message about an overdued level A task.
+    The flags are committed after every batch, so a crash in the middle
+    does not make the next run send the already delivered letters again.
     """
     session = AsyncSessionLocal()
     now_local = datetime.now(LOCAL_TZ)
     try:
-        query = (
-            select(Task)
-            .where(Task.importance_level == "A")
-            .where(Task.completed_at.is_(None))
-            .where(Task.deadline_date < now_local)
-            .where(Task.overdue_notified.is_(False))
+        template = OVERDUE_TEMPLATES[mode]
+        criteria = open_level_a(
+            Task.deadline_date < now_local, Task.overdue_notified.is_(False)
         )
-        result = await session.execute(query)
-        tasks = result.scalars().all()
 
-        for task in tasks:
-            await send_async_email(task, "delay_notification.html")
-            task.overdue_notified = True
+        async with MailSender() as sender:
+            async for batch in iter_notification_batches(
+                session, criteria, mode, template
+            ):
+                errors = await sender.send_many([message for message, _ in batch])
+                sent_ids = sent_task_ids(batch, errors)
 
-        await session.commit()
+                if sent_ids:
+                    await session.execute(
+                        update(Task)
+                        .where(Task.id.in_(sent_ids))
+                        .values(overdue_notified=True)
+                        .execution_options(synchronize_session=False)
+                    )
+                await session.commit()
 
     except Exception as e:
         await session.rollback()
@@ -72,17 +218,108 @@ async def delayed_task_email():
         await session.close()
 
 
+async def deliver_outbox(outbox_ids: list[int]):
+    """
+    Sends the pending outbox notifications and marks the delivered ones as sent.
+    Rows locked by a concurrent delivery are skipped, so a letter goes out once.
+    Raises if some letters failed, to let the Celery task retry them.
+    """
+    session = AsyncSessionLocal()
+    failed = 0
+    try:
+        query = (
+            select(NotificationOutbox, Task)
+            .join(Task, Task.id == NotificationOutbox.task_id)
+            .options(AUTHOR_EMAIL)
+            .where(NotificationOutbox.id.in_(outbox_ids))
+            .where(NotificationOutbox.sent_at.is_(None))
+            .with_for_update(of=NotificationOutbox, skip_locked=True)
+        )
+        result = await session.execute(query)
+        rows = result.all()
+
+        messages = [build_task_message(task, entry.template) for entry, task in rows]
+        async with MailSender() as sender:
+            errors = await sender.send_many(messages)
+
+        sent_at = datetime.now(timezone.utc)
+        for (entry, task), error in zip(rows, errors):
+            entry.attempts += 1
+            if error:
+                failed += 1
+                print(f"Error during sending task {task.id}: {error}")
+            else:
+                entry.sent_at = sent_at
+
+        await session.commit()
+    finally:
+        await session.close()
+
+    if failed:
+        raise RuntimeError(f"{failed} notification(s) were not delivered")
+
+
+async def relay_outbox():
+    """
+    Re-dispatches notifications that were not delivered in time,
+    e.g. because the broker was unavailable when the task was created.
+    """
+    session = AsyncSessionLocal()
+    try:
+        created_before = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.NOTIFICATION_RELAY_DELAY_SECONDS
+        )
+        query = (
+            select(NotificationOutbox.id)
+            .where(NotificationOutbox.sent_at.is_(None))
+            .where(NotificationOutbox.created_at < created_before)
+            .where(NotificationOutbox.attempts < settings.NOTIFICATION_MAX_ATTEMPTS)
+            .order_by(NotificationOutbox.created_at)
+            .limit(settings.MAIL_MAX_MESSAGES_PER_CONNECTION * settings.MAIL_POOL_SIZE)
+        )
+        result = await session.execute(query)
+        outbox_ids = result.scalars().all()
+    finally:
+        await session.close()
+
+    if outbox_ids:
+        await deliver_outbox(outbox_ids)
+
+
+@shared_task(
+    ignore_results=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def send_task_notifications(outbox_ids: list[int]):
+    """
+    Delivers notifications about created tasks, retrying with backoff.
+    Enqueued by TaskService after the task is committed.
+    """
+    async_to_sync(deliver_outbox)(outbox_ids)
+
+
+@shared_task(ignore_results=True)
+def relay_notification_outbox():
+    try:
+        async_to_sync(relay_outbox)()
+    except Exception as e:
+        print(f"Error in relay_notification_outbox: {e}")
+
+
 @shared_task(ignore_results=True)
-def send_uncompleted_task_notification():
+def send_uncompleted_task_notification(mode: str = PER_TASK):
     try:
-        async_to_sync(uncompleted_task_email)()
+        async_to_sync(uncompleted_task_email)(mode)
     except Exception as e:
         print(f"Error in send_uncompleted_task_notification: {e}")
 
 
 @shared_task(ignore_results=True)
-def send_delayed_task_notification():
+def send_delayed_task_notification(mode: str = PER_TASK):
     try:
-        async_to_sync(delayed_task_email)()
+        async_to_sync(delayed_task_email)(mode)
     except Exception as e:
         print(f"Error in send_delayed_task_notification: {e}")
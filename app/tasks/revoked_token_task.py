@@ -1,22 +1,53 @@
 import asyncio
 import datetime
+import time
+from asgiref.sync import async_to_sync
 from celery import shared_task
-from sqlalchemy import delete
+from sqlalchemy import delete, select
 
 from app.db.database import AsyncSessionLocal
 from app.db.models import RevokedToken
+from app.core.config import get_settings
+
+settings = get_settings()
 
 
 async def sql_request():
     """
     Asynchronous function to perform sql-delete operation.
+    Deletes expired tokens in short transactions of TOKEN_CLEANUP_BATCH_SIZE rows
+    with a pause in between, and stops once TOKEN_CLEANUP_TIME_BUDGET_SECONDS
+    are spent: the rest is left for the next run.
     """
     session = AsyncSessionLocal()
+    started = time.monotonic()
     try:
         now = datetime.datetime.now(datetime.UTC)
-        query = delete(RevokedToken).where(RevokedToken.expires_at < now)
-        await session.execute(query)
-        await session.commit()
+        batch = (
+            select(RevokedToken.id)
+            .where(RevokedToken.expires_at < now)
+            .order_by(RevokedToken.expires_at)
+            .limit(settings.TOKEN_CLEANUP_BATCH_SIZE)
+        )
+        query = (
+            delete(RevokedToken)
+            .where(RevokedToken.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+
+        while True:
+            result = await session.execute(query)
+            await session.commit()
+            print(f"Expired tokens deleted: {result.rowcount}")
+
+            if result.rowcount < settings.TOKEN_CLEANUP_BATCH_SIZE:
+                break
+
+            if time.monotonic() - started > settings.TOKEN_CLEANUP_TIME_BUDGET_SECONDS:
+                print("Cleanup time budget is exhausted")
+                break
+
+            await asyncio.sleep(settings.TOKEN_CLEANUP_PAUSE_SECONDS)
     except Exception as e:
         await session.rollback()
         print(f"Error during cleanup: {e}")
@@ -30,5 +61,4 @@ def cleanup_expired_tokens():
     Periodic task to remove expired JWT tokens from the database.
     Triggered daily by Celery Beat.
     """
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(sql_request())
+    async_to_sync(sql_request)()
@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after `ttl` seconds.
+    Lives in the memory of a single process: invalidation in one worker
+    does not reach the others, so stale entries live at most `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        item = self._data.get(key)
+
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Authenticated users by token "sub" (email), see get_current_user
+current_user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
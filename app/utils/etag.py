@@ -0,0 +1,47 @@
+import hashlib
+
+from fastapi import Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Weak ETag of a representation identified by `parts`,
+    e.g. the id and updated_at of a task.
+    """
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def task_etag(task) -> str:
+    """ETag of a single task (model instance or a row with id and updated_at)."""
+    return make_etag(task.id, task.updated_at)
+
+
+def page_etag(versions: list, limit: int) -> str:
+    """
+    ETag of a keyset page from the (id, updated_at) of its rows.
+    `versions` holds up to limit + 1 rows: the extra one only tells
+    whether there is a next page.
+    """
+    return make_etag(len(versions) > limit, *(tuple(row) for row in versions[:limit]))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header with the current ETag.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
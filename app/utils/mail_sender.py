@@ -0,0 +1,144 @@
+import asyncio
+from email.message import EmailMessage
+from email.utils import formataddr
+
+import aiosmtplib
+
+from app.core.config import get_settings
+from app.core.metrics import EMAILS_SENT
+
+settings = get_settings()
+
+# Errors after which the connection can still be reused
+REJECTED = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+
+def build_message(recipient: str, subject: str, html: str) -> EmailMessage:
+    """
+    Wraps rendered html into a ready-to-send message.
+    """
+    message = EmailMessage()
+    message["From"] = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+    message["To"] = recipient
+    message["Subject"] = subject
+    message.set_content(html, "html")
+    return message
+
+
+class MailSender:
+    """
+    Keeps up to `pool_size` authenticated SMTP connections open and sends
+    many messages over each of them. A connection is closed after
+    `max_messages_per_connection` messages, since providers limit that.
+
+    Connections belong to the running event loop, so a sender is meant
+    to be used as `async with MailSender() as sender` within one loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = settings.MAIL_POOL_SIZE,
+        max_messages_per_connection: int = settings.MAIL_MAX_MESSAGES_PER_CONNECTION,
+    ):
+        self.pool_size = pool_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self._idle: list[aiosmtplib.SMTP] = []
+        self._sent_by: dict[aiosmtplib.SMTP, int] = {}
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.MAIL_SERVER,
+            port=settings.MAIL_PORT,
+            use_tls=True,  # Port 465
+            validate_certs=False,
+        )
+        await smtp.connect()
+        try:
+            await smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+
+        self.connections_opened += 1
+        self._sent_by[smtp] = 0
+        return smtp
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            smtp = self._idle.pop()
+            if smtp.is_connected:
+                return smtp
+            self._sent_by.pop(smtp, None)
+
+        return await self._connect()
+
+    async def _release(self, smtp: aiosmtplib.SMTP, broken: bool = False):
+        if broken or self._sent_by[smtp] >= self.max_messages_per_connection:
+            self._sent_by.pop(smtp, None)
+            await self._quit(smtp)
+        else:
+            self._idle.append(smtp)
+
+    @staticmethod
+    async def _quit(smtp: aiosmtplib.SMTP):
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def send(self, message: EmailMessage):
+        async with self._slots:
+            smtp = await self._acquire()
+            try:
+                try:
+                    await smtp.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # An idle connection may have been dropped by the server: retry once
+                    self._sent_by.pop(smtp, None)
+                    smtp.close()
+                    smtp = await self._connect()
+                    await smtp.send_message(message)
+            except REJECTED:
+                # The server refused this message, the connection itself is fine.
+                # Not tracked if it was the reconnect that got rejected
+                if smtp in self._sent_by:
+                    await self._release(smtp)
+                raise
+            except Exception:
+                if smtp in self._sent_by:
+                    await self._release(smtp, broken=True)
+                raise
+
+            self._sent_by[smtp] += 1
+            self.messages_sent += 1
+            EMAILS_SENT.inc()
+            await self._release(smtp)
+
+    async def send_many(self, messages: list[EmailMessage]) -> list[Exception | None]:
+        """
+        Sends messages concurrently over the pool.
+        Returns an error (or None on success) for every message, in order.
+        """
+
+        async def deliver(message):
+            try:
+                await self.send(message)
+            except Exception as e:
+                return e
+            return None
+
+        return await asyncio.gather(*(deliver(message) for message in messages))
+
+    async def close(self):
+        while self._idle:
+            await self._quit(self._idle.pop())
+        self._sent_by.clear()
@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from app.exceptions.tasks import InvalidCursorException
+
+
+def _pack(position: list) -> str:
+    raw = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _unpack(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    """
+    Packs the (created_at, id) position of the last row on a page
+    into an opaque url-safe string.
+    """
+    return _pack([created_at.isoformat(), task_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Restores the (created_at, id) position from a cursor
+    issued by encode_cursor.
+    """
+    try:
+        created_at, task_id = _unpack(cursor)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorException()
+
+
+def encode_rank_cursor(rank: float, task_id: int) -> str:
+    """
+    Packs the (search rank, id) position of the last search result on a page.
+    """
+    return _pack([rank, task_id])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Restores the (search rank, id) position from a cursor
+    issued by encode_rank_cursor.
+    """
+    try:
+        rank, task_id = _unpack(cursor)
+        return float(rank), int(task_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorException()
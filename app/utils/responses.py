@@ -0,0 +1,46 @@
+from operator import attrgetter
+
+from fastapi.responses import ORJSONResponse
+
+from app.utils.timefmt import format_local
+
+# Fields of app.api.schemas.tasks.Task, in its output order
+TASK_FIELDS = (
+    "title",
+    "content",
+    "importance_level",
+    "id",
+    "user_email",
+    "remark",
+    "created_at",
+    "deadline_date",
+    "updated_at",
+    "completed_at",
+)
+TASK_DATETIME_FIELDS = {"created_at", "deadline_date", "updated_at", "completed_at"}
+
+task_values = attrgetter(*TASK_FIELDS)
+
+
+def dump_tasks(rows) -> list[dict]:
+    """
+    Serializes task rows exactly like the Task schema (DateTimeHuman included),
+    without validating every row through pydantic.
+    """
+    items = []
+    for row in rows:
+        item = dict(zip(TASK_FIELDS, task_values(row)))
+        for field in TASK_DATETIME_FIELDS:
+            if item[field] is not None:
+                item[field] = format_local(item[field])
+        items.append(item)
+
+    return items
+
+
+def task_page_response(page: dict, headers: dict | None = None) -> ORJSONResponse:
+    """
+    TaskPage response of task rows, encoded with orjson.
+    """
+    content = {"items": dump_tasks(page["items"]), "next_cursor": page["next_cursor"]}
+    return ORJSONResponse(content, headers=headers)
@@ -1,48 +1,62 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from zoneinfo import ZoneInfo
+from datetime import datetime
 
 from app.core.config import get_settings
-from pathlib import Path
+from app.utils.mail_sender import build_message
+from app.utils.templates import renderer
+from app.utils.timefmt import format_local
 
 settings = get_settings()
 
-TEMPLATE_FOLDER = Path(__file__).parent.parent / "templates"
+SUBJECT = "Уведомление о задаче наивысшего приоритета"
 
-LOCAL_TZ = ZoneInfo(settings.TZ_IANA)
 
+def task_template_data(task) -> dict:
+    return {
+        "title": task.title,
+        "content": task.content,
+        "deadline": format_local(task.deadline_date),
+        "admin_email": settings.ADMIN_EMAIL,
+    }
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_STARTTLS=False,  # Use True for Port 587
-    MAIL_SSL_TLS=True,  # Use True for Port 465
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=False,
-    TEMPLATE_FOLDER=TEMPLATE_FOLDER,
-)
 
+def build_task_message(task, template):
+    """
+    Notification letter about a task, to be sent through MailSender.
+    """
+    html = renderer.render(template, task_template_data(task))
+    return build_message(task.user_email, SUBJECT, html)
 
-async def send_async_email(task, template):
+
+def build_task_messages(tasks, template) -> list:
     """
-    Asynchronous sending of notification letters about level A tasks.
+    Notification letters about a batch of tasks, rendered in one pass.
     """
-    deadline = task.deadline_date.astimezone(LOCAL_TZ).strftime("%Y-%m-%d %H:%M")
-    template_data = {
-        "title": task.title,
-        "content": task.content,
-        "deadline": deadline,
+    htmls = renderer.render_many(template, [task_template_data(t) for t in tasks])
+    return [build_message(t.user_email, SUBJECT, h) for t, h in zip(tasks, htmls)]
+
+
+def digest_template_data(tasks: list[dict]) -> dict:
+    """
+    `tasks` come from json_agg, so deadlines are ISO 8601 strings.
+    """
+    return {
+        "tasks": [
+            {
+                "title": task["title"],
+                "content": task["content"],
+                "deadline": format_local(datetime.fromisoformat(task["deadline"])),
+            }
+            for task in tasks
+        ],
         "admin_email": settings.ADMIN_EMAIL,
     }
 
-    message = MessageSchema(
-        subject=f"Уведомление о задаче наивысшего приоритета",
-        recipients=[task.user_email],
-        template_body=template_data,
-        subtype=MessageType.html,
+
+def build_digest_messages(rows, template) -> list:
+    """
+    One letter per (email, tasks) row listing all the tasks of the recipient.
+    """
+    htmls = renderer.render_many(
+        template, [digest_template_data(row.tasks) for row in rows]
     )
-    fm = FastMail(conf)
-    await fm.send_message(message, template_name=template)
+    return [build_message(r.email, SUBJECT, h) for r, h in zip(rows, htmls)]
@@ -0,0 +1,57 @@
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, Template
+
+TEMPLATE_FOLDER = Path(__file__).parent.parent / "templates"
+
+
+class TemplateRenderer:
+    """
+    Compiles every template once per process and keeps it in memory.
+    Unlike a default Jinja environment, it never checks the template files
+    for changes again, so rendering costs no filesystem access.
+    Keeps counters of compile and render time.
+    """
+
+    def __init__(self, folder: Path):
+        # Same loader setup as fastapi-mail, so the rendered html does not change
+        self._env = Environment(loader=FileSystemLoader(folder), auto_reload=False)
+        self._compiled: dict[str, Template] = {}
+        self.compile_seconds = 0.0
+        self.render_seconds = 0.0
+        self.rendered = 0
+
+    def get(self, name: str) -> Template:
+        template = self._compiled.get(name)
+
+        if template is None:
+            start = time.perf_counter()
+            template = self._compiled[name] = self._env.get_template(name)
+            self.compile_seconds += time.perf_counter() - start
+
+        return template
+
+    def render(self, name: str, context: dict) -> str:
+        return self.render_many(name, [context])[0]
+
+    def render_many(self, name: str, contexts: list[dict]) -> list[str]:
+        template = self.get(name)
+
+        start = time.perf_counter()
+        rendered = [template.render(**context) for context in contexts]
+        self.render_seconds += time.perf_counter() - start
+        self.rendered += len(rendered)
+
+        return rendered
+
+    def stats(self) -> dict:
+        return {
+            "templates": len(self._compiled),
+            "compile_seconds": self.compile_seconds,
+            "render_seconds": self.render_seconds,
+            "rendered": self.rendered,
+        }
+
+
+renderer = TemplateRenderer(TEMPLATE_FOLDER)
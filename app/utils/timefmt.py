@@ -0,0 +1,84 @@
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# The only ZoneInfo of the application, shared by all modules that need local time
+LOCAL_TZ = ZoneInfo(settings.TZ_IANA)
+
+LOCAL_FORMAT = "%Y-%m-%d %H:%M"
+
+# Distinct minutes remembered; 2^16 minutes is about 45 days of timestamps
+MINUTE_CACHE_SIZE = 65536
+
+# Offset transitions are precomputed for this many years around the start time
+TRANSITION_YEARS = 10
+
+DAY = 86400
+
+
+def _utc_offset(timestamp: int) -> int:
+    return int(datetime.fromtimestamp(timestamp, LOCAL_TZ).utcoffset().total_seconds())
+
+
+def _offset_transitions(start: int, end: int) -> tuple[list[int], list[int]]:
+    """
+    UTC timestamps at which LOCAL_TZ changes its offset between `start` and `end`,
+    with the offset in effect from each of them on. Probes one point per day
+    and bisects the days on which the offset changes down to the second.
+    """
+    instants, offsets = [start], [_utc_offset(start)]
+
+    for day in range(start, end, DAY):
+        if _utc_offset(day + DAY) == offsets[-1]:
+            continue
+
+        low, high = day, day + DAY
+        while high - low > 1:
+            middle = (low + high) // 2
+            if _utc_offset(middle) == offsets[-1]:
+                low = middle
+            else:
+                high = middle
+
+        instants.append(high)
+        offsets.append(_utc_offset(high))
+
+    return instants, offsets
+
+
+_now = int(time.time()) // DAY * DAY
+RANGE_START = _now - TRANSITION_YEARS * 365 * DAY
+RANGE_END = _now + TRANSITION_YEARS * 365 * DAY
+TRANSITIONS, OFFSETS = _offset_transitions(RANGE_START, RANGE_END)
+
+
+@lru_cache(maxsize=1024)
+def _format_day(day: int) -> str:
+    return (date(1970, 1, 1) + timedelta(days=day)).strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=MINUTE_CACHE_SIZE)
+def _format_minute(minute: int) -> str:
+    timestamp = minute * 60
+    if not RANGE_START <= timestamp < RANGE_END:
+        return datetime.fromtimestamp(timestamp, LOCAL_TZ).strftime(LOCAL_FORMAT)
+
+    offset = OFFSETS[bisect_right(TRANSITIONS, timestamp) - 1]
+    day, seconds = divmod(timestamp + offset, DAY)
+    return f"{_format_day(day)} {seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+
+
+def format_local(dt: datetime) -> str:
+    """
+    Formats a datetime as local "YYYY-MM-DD HH:MM" in settings.TZ_IANA.
+    The output only depends on the minute, so it is memoized per UTC minute:
+    deadlines in particular share a handful of minutes. On a miss the local
+    time comes from the precomputed offset transitions, not from astimezone.
+    """
+    return _format_minute(int(dt.timestamp() // 60))
@@ -0,0 +1,55 @@
+"""
+Serialization of a task page: the TaskPage schema against task_page_response.
+
+    python -m tests.benchmarks.bench_task_serialization [rows] [repeats]
+
+Needs the same environment as the app (DATABASE_URL, SECRET_KEY, MAIL_*).
+"""
+
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.api.schemas.tasks import TaskPage
+from app.utils.responses import task_page_response
+
+
+def make_rows(count: int) -> list[SimpleNamespace]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            title=f"Задача {i}",
+            content="Содержание задачи " * 10,
+            importance_level="ABCD"[i % 4],
+            id=i,
+            user_email=f"user{i % 50}@example.com",
+            remark=None,
+            created_at=start + timedelta(minutes=17 * i),
+            deadline_date=start + timedelta(days=i % 30),
+            updated_at=start + timedelta(minutes=17 * i, seconds=i),
+            completed_at=None if i % 3 else start + timedelta(days=1),
+        )
+        for i in range(count)
+    ]
+
+
+def main(rows: int = 100, repeats: int = 2000):
+    page = {"items": make_rows(rows), "next_cursor": "cursor"}
+
+    def schema():
+        TaskPage.model_validate(page, from_attributes=True).model_dump_json()
+
+    def fast():
+        task_page_response(page)
+
+    for name, func in (
+        ("TaskPage.model_dump_json", schema),
+        ("task_page_response", fast),
+    ):
+        seconds = min(timeit.repeat(func, number=repeats, repeat=5)) / repeats
+        print(f"{name:>26}: {seconds * 1e6:9.1f} us per page of {rows} tasks")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""
+Formatting of task timestamps: format_local against astimezone().strftime().
+
+    python -m tests.benchmarks.bench_timefmt [count]
+
+Needs the same environment as the app (DATABASE_URL, SECRET_KEY, MAIL_*).
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.utils.timefmt import LOCAL_FORMAT, LOCAL_TZ, format_local
+
+
+def make_timestamps(count: int) -> list[datetime]:
+    """
+    Half of them are deadlines, which fall on a few distinct minutes,
+    the other half creation times spread over 30 days.
+    """
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(0)
+    deadlines = [start + timedelta(days=day, hours=21) for day in range(30)]
+    return [
+        rng.choice(deadlines)
+        if i % 2
+        else start + timedelta(seconds=rng.randrange(30 * 86400))
+        for i in range(count)
+    ]
+
+
+def main(count: int = 1_000_000):
+    timestamps = make_timestamps(count)
+
+    def astimezone():
+        for dt in timestamps:
+            dt.astimezone(LOCAL_TZ).strftime(LOCAL_FORMAT)
+
+    def memoized():
+        for dt in timestamps:
+            format_local(dt)
+
+    for name, func in (
+        ("astimezone().strftime()", astimezone),
+        ("format_local", memoized),
+    ):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        print(f"{name:>24}: {seconds:6.2f} s for {count} timestamps")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,95 @@
+import datetime
+from unittest.mock import Mock
+
+import fakeredis
+import jwt
+import pytest
+from sqlalchemy import select
+
+from app.core.denylist import BloomFilter, RedisTokenDenylist
+from app.core.security import ALGORITHM, SECRET_KEY, create_refresh_token
+from app.db.models import RevokedToken
+from app.services import auth_service
+
+pytestmark = pytest.mark.anyio
+
+EXPIRES_AT = datetime.datetime.now(datetime.UTC) + datetime.timedelta(days=1)
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def make_denylist(server) -> RedisTokenDenylist:
+    """A worker's denylist: its own Bloom filter over the shared Redis."""
+    return RedisTokenDenylist(
+        fakeredis.FakeAsyncRedis(server=server), BloomFilter(1000, 0.01)
+    )
+
+
+async def test_unknown_jti_skips_redis(redis_server):
+    denylist = make_denylist(redis_server)
+
+    assert not await denylist.is_revoked("jti", Mock())
+    assert denylist.bloom_skips == 1
+    assert denylist.redis_lookups == 0
+
+
+async def test_revoked_jti_is_found(redis_server):
+    denylist = make_denylist(redis_server)
+    session = Mock()
+
+    assert await denylist.revoke("jti", EXPIRES_AT, session)
+    assert await denylist.is_revoked("jti", session)
+    assert denylist.redis_lookups == 1
+    session.add.assert_called_once()
+
+
+async def test_revoke_by_another_worker_loses(redis_server):
+    assert await make_denylist(redis_server).revoke("jti", EXPIRES_AT, Mock())
+
+    assert not await make_denylist(redis_server).revoke("jti", EXPIRES_AT, Mock())
+
+
+async def test_unavailable_redis_falls_back_to_sql(redis_server):
+    denylist = make_denylist(redis_server)
+    redis_server.connected = False
+
+    assert await denylist.revoke("jti", EXPIRES_AT, Mock())
+    assert denylist.fallbacks == 1
+
+
+async def test_refresh_of_token_revoked_only_in_sql(
+    client, db_session, user, redis_server, monkeypatch
+):
+    # Revoked while the SQL backend was used, or Redis was flushed since
+    token = create_refresh_token({"sub": user.email})
+    jti = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["jti"]
+    db_session.add(RevokedToken(jti=jti, expires_at=EXPIRES_AT))
+    await db_session.commit()
+
+    denylist = make_denylist(redis_server)
+    monkeypatch.setattr(auth_service, "get_token_denylist", lambda: denylist)
+
+    response = await client.post("/auth/refresh", headers={"x-refresh-token": token})
+
+    assert response.status_code == 401
+    assert response.json()["error_code"] == "TOKEN_REVOKED"
+
+
+async def test_refresh_revokes_token_once(
+    client, db_session, user, redis_server, monkeypatch
+):
+    token = create_refresh_token({"sub": user.email})
+    monkeypatch.setattr(
+        auth_service, "get_token_denylist", lambda: make_denylist(redis_server)
+    )
+
+    first = await client.post("/auth/refresh", headers={"x-refresh-token": token})
+    second = await client.post("/auth/refresh", headers={"x-refresh-token": token})
+
+    assert first.status_code == 200
+    assert second.status_code == 401
+    result = await db_session.execute(select(RevokedToken.jti))
+    assert len(result.all()) == 1
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Task, User
+from app.services.task_service import TASK_ROW, TaskService
+from app.tasks.notification_email import AUTHOR_EMAIL, open_level_a
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def page(query):
+    query = query.with_only_columns(*TASK_ROW).join_from(
+        Task, User, User.id == Task.user_id
+    )
+    return TaskService._page_query(query, 20, None)
+
+
+def notification_batch(*criteria):
+    return (
+        select(Task)
+        .options(AUTHOR_EMAIL)
+        .where(*open_level_a(*criteria))
+        .order_by(Task.deadline_date, Task.id)
+        .limit(100)
+    )
+
+
+def digest_recipients(*criteria):
+    return (
+        select(Task.user_id)
+        .where(*open_level_a(*criteria))
+        .distinct()
+        .order_by(Task.user_id)
+        .limit(100)
+    )
+
+
+QUERIES = {
+    "my_tasks": page(select(Task).where(Task.user_id == 1)),
+    "all_tasks": page(select(Task)),
+    "open_tasks_of_level": page(TaskService._all_tasks_query("A", False)),
+    "reminders": notification_batch(Task.deadline_date > NOW),
+    "overdue": notification_batch(
+        Task.deadline_date < NOW, Task.overdue_notified.is_(False)
+    ),
+    "digest_recipients": digest_recipients(Task.deadline_date > NOW),
+    "digest_tasks": select(Task.id).where(
+        *open_level_a(Task.deadline_date > NOW), Task.user_id.in_([1, 2])
+    ),
+}
+
+
+@pytest.mark.parametrize("name", QUERIES)
+async def test_task_queries_use_indexes(db_session, name):
+    sql = QUERIES[name].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    # The tables are empty: seq scans are only taken when no index can serve the query
+    await db_session.execute(text("SET enable_seqscan = off"))
+    result = await db_session.execute(text(f"EXPLAIN {sql}"))
+    plan = "\n".join(str(row[0]) for row in result)
+
+    assert "Seq Scan on tasks" not in plan, plan
@@ -0,0 +1,60 @@
+import socket
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.tasks import metrics
+from app.tasks.metrics import job_finished, job_started, render_job_metrics
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def silent_redis(monkeypatch):
+    """REDIS_URL of a server that accepts connections and never answers."""
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        host, port = server.getsockname()
+        monkeypatch.setattr(metrics.settings, "REDIS_URL", f"redis://{host}:{port}/0")
+        monkeypatch.setattr(metrics.settings, "METRICS_REDIS_TIMEOUT_SECONDS", 0.2)
+        monkeypatch.setattr(metrics, "_client", None)
+        monkeypatch.setattr(metrics, "_async_client", None)
+        yield
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(metrics, "_client", fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(
+        metrics, "_async_client", fakeredis.FakeAsyncRedis(server=server)
+    )
+
+
+async def test_job_metrics_are_rendered(fake_redis):
+    job_started(task_id="1")
+    job_finished(task_id="1", task=SimpleNamespace(name="job"), state="SUCCESS")
+
+    lines = await render_job_metrics()
+
+    assert 'celery_jobs_total{task="job",state="SUCCESS"} 1' in lines
+    assert 'celery_job_duration_seconds_count{task="job"} 1' in lines
+
+
+async def test_unresponsive_redis_leaves_job_metrics_out(silent_redis):
+    start = time.monotonic()
+
+    assert await render_job_metrics() == []
+    assert time.monotonic() - start < 2
+
+
+def test_unresponsive_redis_does_not_hold_the_worker(silent_redis):
+    start = time.monotonic()
+
+    job_started(task_id="1")
+    job_finished(task_id="1", task=SimpleNamespace(name="job"), state="SUCCESS")
+
+    assert time.monotonic() - start < 2
@@ -0,0 +1,146 @@
+import datetime
+import socket
+import ssl
+
+import aiosmtplib
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from app.utils import mail_sender
+from app.utils.mail_sender import MailSender, build_message
+
+pytestmark = pytest.mark.anyio
+
+
+class Mailbox:
+    """aiosmtpd handler that keeps the delivered messages and counts logins."""
+
+    def __init__(self):
+        self.messages = []
+        self.logins = 0
+        # Failure injection: logins after this many are refused,
+        # the connection is closed instead of accepting the next message
+        self.max_logins = None
+        self.drop_next = False
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        success = self.max_logins is None or self.logins <= self.max_logins
+        # handled=False: aiosmtpd itself answers a failure with 535
+        return AuthResult(success=success, handled=False)
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.drop_next:
+            self.drop_next = False
+            server.transport.close()
+            return "421 Closing connection"
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _tls_context(tmp_path) -> ssl.SSLContext:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = tmp_path / "cert.pem"
+    key_file = tmp_path / "key.pem"
+    cert_file.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def mailbox(tmp_path, monkeypatch):
+    """SMTP server over implicit TLS that MailSender connects to."""
+    mailbox = Mailbox()
+    controller = Controller(
+        mailbox,
+        hostname="127.0.0.1",
+        port=_free_port(),
+        ssl_context=_tls_context(tmp_path),
+        authenticator=mailbox.authenticate,
+        auth_require_tls=False,
+    )
+    controller.start()
+    monkeypatch.setattr(mail_sender.settings, "MAIL_SERVER", controller.hostname)
+    monkeypatch.setattr(mail_sender.settings, "MAIL_PORT", controller.port)
+
+    yield mailbox
+
+    controller.stop()
+
+
+def _messages(count: int) -> list:
+    return [
+        build_message(f"user{i}@example.com", "Subject", "<p>Text</p>")
+        for i in range(count)
+    ]
+
+
+async def test_messages_share_one_connection(mailbox):
+    async with MailSender(pool_size=1) as sender:
+        for message in _messages(5):
+            await sender.send(message)
+
+    assert sender.messages_sent == 5
+    assert sender.connections_opened == 1
+    assert mailbox.logins == 1
+    assert len(mailbox.messages) == 5
+
+
+async def test_connection_is_replaced_after_message_limit(mailbox):
+    async with MailSender(pool_size=2, max_messages_per_connection=3) as sender:
+        errors = await sender.send_many(_messages(10))
+
+    assert errors == [None] * 10
+    assert sender.messages_sent == 10
+    # 10 messages, at most 3 per connection and at most 2 partly used ones
+    assert sender.connections_opened == 4
+    assert mailbox.logins == 4
+    assert len(mailbox.messages) == 10
+
+
+async def test_rejected_reconnect_is_reported(mailbox):
+    mailbox.max_logins = 1
+    mailbox.drop_next = True
+
+    async with MailSender(pool_size=1) as sender:
+        errors = await sender.send_many(_messages(1))
+
+        assert sender._sent_by == {}
+
+    assert isinstance(errors[0], aiosmtplib.SMTPAuthenticationError)
+    assert sender.messages_sent == 0
+    # The first connection, then the reconnect trying both PLAIN and LOGIN
+    assert mailbox.logins == 3
+    assert mailbox.messages == []
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.models import Task
+from app.tasks import notification_email
+from app.tasks.notification_email import iter_digest_batches, open_level_a
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_digest_batches_group_tasks_per_recipient(
+    db_session, make_user, monkeypatch
+):
+    monkeypatch.setattr(notification_email.settings, "NOTIFICATION_BATCH_SIZE", 2)
+    deadline = datetime.now(timezone.utc) + timedelta(days=1)
+    users = [await make_user() for _ in range(3)]
+    for user, count in zip(users, (2, 1, 3)):
+        db_session.add_all(
+            Task(
+                title="Title",
+                content="Content",
+                importance_level="A",
+                deadline_date=deadline + timedelta(hours=i),
+                user_id=user.id,
+            )
+            for i in range(count)
+        )
+    # Not matched: completed, or of another level
+    db_session.add_all(
+        [
+            Task(
+                title="Title",
+                content="Content",
+                importance_level="A",
+                deadline_date=deadline,
+                completed_at=datetime.now(timezone.utc),
+                user_id=users[1].id,
+            ),
+            Task(
+                title="Title",
+                content="Content",
+                importance_level="B",
+                deadline_date=deadline,
+                user_id=users[1].id,
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    criteria = open_level_a(Task.deadline_date > datetime.now(timezone.utc))
+    batches = [rows async for rows in iter_digest_batches(db_session, criteria)]
+
+    assert [[(row.email, len(row.tasks)) for row in rows] for rows in batches] == [
+        [(users[0].email, 2), (users[1].email, 1)],
+        [(users[2].email, 3)],
+    ]
+    deadlines = [task["deadline"] for task in batches[1][0].tasks]
+    assert deadlines == sorted(deadlines)
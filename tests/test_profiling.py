@@ -0,0 +1,43 @@
+import copy
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+
+from app.db import profiling
+from app.db.profiling import QueryProfile, current_profile, install_sql_profiling
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def profiled_engine(db_engine):
+    install_sql_profiling(db_engine)
+
+    yield db_engine
+
+    for name in ("before_cursor_execute", "after_cursor_execute"):
+        listener = getattr(profiling, f"_{name}")
+        event.remove(db_engine.sync_engine, name, listener)
+
+
+async def test_failed_statement_leaves_nothing_behind(profiled_engine, monkeypatch):
+    monkeypatch.setattr(profiling.settings, "SQL_PROFILING_SLOW_QUERY_SECONDS", 0.05)
+    profile = QueryProfile()
+    token = current_profile.set(profile)
+
+    async with profiled_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+        # The pooled connection's info outlives the request
+        info = copy.deepcopy(connection.info)
+
+        with pytest.raises(DBAPIError):
+            await connection.execute(text("SELECT pg_sleep(0.1), 1 / 0"))
+        await connection.rollback()
+        await connection.execute(text("SELECT 2"))
+
+        assert connection.info == info
+
+    current_profile.reset(token)
+    assert profile.queries == 2
+    assert profile.slow == []
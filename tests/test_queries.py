@@ -0,0 +1,99 @@
+import pytest
+
+from app.db.models import Task
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def task(db_session, user):
+    task = Task(title="Title", content="Content", importance_level="A", user_id=user.id)
+    db_session.add(task)
+    await db_session.commit()
+    return task
+
+
+@pytest.fixture
+def no_notifications(monkeypatch):
+    async def enqueue(outbox_ids):
+        pass
+
+    monkeypatch.setattr(TaskService, "_enqueue_notifications", staticmethod(enqueue))
+
+
+@pytest.mark.parametrize(
+    "method, path, count",
+    [
+        # The authentication query and the page
+        ("GET", "/tasks/", 2),
+        ("GET", "/tasks/my", 2),
+        ("GET", "/tasks/{task_id}", 2),
+        # The counters and the overdue tasks
+        ("GET", "/tasks/stats", 3),
+        ("PATCH", "/tasks/{task_id}", 2),
+        ("PATCH", "/tasks/complete/{task_id}", 3),
+        ("DELETE", "/tasks/{task_id}", 3),
+    ],
+)
+async def test_task_endpoint_statements(
+    client, statements, auth_headers, user, task, method, path, count
+):
+    statements.clear()
+    response = await client.request(
+        method,
+        path.format(task_id=task.id),
+        headers=auth_headers(user),
+        json={"content": "New content"} if method == "PATCH" else None,
+    )
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == count, statements
+
+
+async def test_create_task_statements(
+    client, statements, auth_headers, user, no_notifications
+):
+    statements.clear()
+    response = await client.post(
+        "/tasks/",
+        headers=auth_headers(user),
+        json={"title": "Title", "content": "Content", "importance_level": "B"},
+    )
+
+    assert response.status_code == 200, response.text
+    # Authentication, the task and outbox INSERTs, the task_stats upsert
+    # and the task with its author's email
+    assert len(statements) == 5, statements
+    # The tsvector is never sent back to the application
+    assert not any("search_vector" in statement for statement in statements)
+
+
+@pytest.mark.parametrize(
+    "path, count",
+    [
+        ("/users/", 2),
+        ("/users/{user_id}", 2),
+        ("/tasks/stats/all", 3),
+    ],
+)
+async def test_admin_endpoint_statements(
+    client, statements, auth_headers, admin, user, task, path, count
+):
+    statements.clear()
+    response = await client.get(
+        path.format(user_id=user.id), headers=auth_headers(admin)
+    )
+
+    assert response.status_code == 200, response.text
+    assert len(statements) == count, statements
+
+
+async def test_cached_user_is_not_queried(client, statements, auth_headers, user):
+    await client.get("/tasks/my", headers=auth_headers(user))
+    statements.clear()
+
+    response = await client.get("/tasks/my", headers=auth_headers(user))
+
+    assert response.status_code == 200
+    assert len(statements) == 1, statements
@@ -0,0 +1,33 @@
+import socket
+import time
+
+import pytest
+
+from app.db import database
+from app.db.database import AsyncSessionLocal, ReplicaRouter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def silent_server():
+    """Accepts TCP connections and never answers."""
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        yield server.getsockname()
+
+
+async def test_unresponsive_replica_times_out(silent_server, monkeypatch):
+    monkeypatch.setattr(database.settings, "REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS", 0.2)
+    host, port = silent_server
+    router = ReplicaRouter([f"postgresql+asyncpg://user:password@{host}:{port}/db"])
+
+    start = time.monotonic()
+    session_factory = await router.read_sessionmaker()
+
+    assert time.monotonic() - start < 2
+    assert session_factory is AsyncSessionLocal
+    assert router.primary_fallbacks == 1
+    assert not router.replicas[0].healthy
+    await router.replicas[0].engine.dispose()
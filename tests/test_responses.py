@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.schemas.tasks import TaskPage
+from app.utils.responses import TASK_FIELDS, dump_tasks, task_page_response
+
+CREATED_AT = datetime(2026, 3, 29, 0, 30, tzinfo=timezone.utc)
+
+
+def task_row(task_id: int, **fields) -> SimpleNamespace:
+    """Stand-in for a row of TASK_ROW: the task columns and user_email."""
+    values = {
+        "title": "Задача",
+        "content": 'Текст с "кавычками" и \\ переводом\nстроки',
+        "importance_level": "A",
+        "id": task_id,
+        "user_email": "user@example.com",
+        "remark": None,
+        "created_at": CREATED_AT,
+        "deadline_date": None,
+        "updated_at": CREATED_AT,
+        "completed_at": None,
+    }
+    values.update(fields)
+    assert values.keys() == set(TASK_FIELDS)
+    return SimpleNamespace(**values)
+
+
+ROWS = [
+    task_row(1),
+    task_row(
+        2,
+        remark="Замечание",
+        deadline_date=CREATED_AT + timedelta(days=1),
+        updated_at=CREATED_AT + timedelta(hours=3, seconds=59),
+        completed_at=CREATED_AT + timedelta(days=200),
+    ),
+    # Offsets other than UTC are converted to the local time zone as well
+    task_row(
+        3, created_at=datetime(2026, 10, 25, 3, 0, tzinfo=timezone(timedelta(hours=5)))
+    ),
+]
+
+
+@pytest.mark.parametrize("next_cursor", [None, "cursor"])
+def test_task_page_response_matches_schema(next_cursor):
+    page = {"items": ROWS, "next_cursor": next_cursor}
+    expected = TaskPage.model_validate(page, from_attributes=True).model_dump_json()
+
+    assert task_page_response(page).body == expected.encode()
+
+
+def test_dump_tasks_matches_schema():
+    page = TaskPage.model_validate({"items": ROWS}, from_attributes=True)
+
+    assert dump_tasks(ROWS) == page.model_dump(mode="json")["items"]
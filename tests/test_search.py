@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+
+from app.db.models import SEARCH_TS_CONFIG, Task
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_stems_like_the_column(client, db_session, auth_headers, user):
+    db_session.add_all(
+        [
+            Task(
+                title="Отчеты",
+                content="Собрать квартальные отчеты",
+                importance_level="A",
+                user_id=user.id,
+            ),
+            Task(
+                title="Звонок",
+                content="Позвонить клиенту",
+                importance_level="B",
+                user_id=user.id,
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.get(
+        "/tasks/search", params={"q": "отчетов"}, headers=auth_headers(user)
+    )
+
+    assert response.status_code == 200, response.text
+    assert [item["title"] for item in response.json()["items"]] == ["Отчеты"]
+
+
+async def test_column_uses_search_config(db_session):
+    result = await db_session.execute(
+        text(
+            "SELECT pg_get_expr(d.adbin, d.adrelid) FROM pg_attrdef d "
+            "JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum "
+            "WHERE d.adrelid = 'tasks'::regclass AND a.attname = 'search_vector'"
+        )
+    )
+
+    assert f"'{SEARCH_TS_CONFIG}'::regconfig" in result.scalar_one()
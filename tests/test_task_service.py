@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+from loguru import logger
+from sqlalchemy import select
+
+from app.db.models import NotificationOutbox
+from app.services.task_service import TaskService
+from app.tasks.celery_app import celery_app
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def warnings():
+    """Messages of the warnings logged from now on."""
+    messages = []
+    sink = logger.add(
+        lambda message: messages.append(message.record["message"]), level="WARNING"
+    )
+
+    yield messages
+
+    logger.remove(sink)
+
+
+@pytest.fixture
+def broker_down(monkeypatch):
+    attempts = []
+
+    def send_task(name, args, retry):
+        attempts.append(args)
+        raise ConnectionRefusedError("Connection refused")
+
+    monkeypatch.setattr(celery_app, "send_task", send_task)
+    return attempts
+
+
+async def test_notifications_are_published_off_the_event_loop(monkeypatch):
+    published = []
+
+    def send_task(name, args, retry):
+        published.append((args, threading.get_ident()))
+
+    monkeypatch.setattr(celery_app, "send_task", send_task)
+
+    await TaskService._enqueue_notifications([1, 2])
+
+    assert len(published) == 1
+    assert published[0][0] == [[1, 2]]
+    assert published[0][1] != threading.get_ident()
+
+
+async def test_unavailable_broker_is_logged(broker_down, warnings):
+    await TaskService._enqueue_notifications([1])
+
+    assert broker_down == [[[1]]]
+    assert warnings == ["Notifications [1] left in the outbox: Connection refused"]
+
+
+async def test_unavailable_broker_leaves_notifications_in_outbox(
+    client, db_session, auth_headers, user, broker_down, warnings
+):
+    response = await client.post(
+        "/tasks/",
+        headers=auth_headers(user),
+        json={"title": "Title", "content": "Content", "importance_level": "A"},
+    )
+
+    assert response.status_code == 200, response.text
+    result = await db_session.execute(
+        select(NotificationOutbox.task_id, NotificationOutbox.sent_at)
+    )
+    assert result.all() == [(response.json()["id"], None)]
+    assert len(warnings) == 1
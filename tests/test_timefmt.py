@@ -0,0 +1,73 @@
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.utils import timefmt
+
+DST_ZONES = [
+    "Europe/Berlin",
+    "America/New_York",
+    "America/Sao_Paulo",
+    # Shifts by 30 minutes
+    "Australia/Lord_Howe",
+]
+ZONES = [timefmt.settings.TZ_IANA, *DST_ZONES]
+
+
+@pytest.fixture
+def timefmt_in(monkeypatch):
+    """A separate copy of app.utils.timefmt built for another TZ_IANA."""
+
+    def load(zone: str):
+        monkeypatch.setattr(timefmt.settings, "TZ_IANA", zone)
+        spec = importlib.util.spec_from_file_location(
+            f"timefmt_{zone.replace('/', '_')}", timefmt.__file__
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
+
+
+def expected(dt: datetime, zone: str) -> str:
+    return dt.astimezone(ZoneInfo(zone)).strftime(timefmt.LOCAL_FORMAT)
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_minutes_around_transitions(timefmt_in, zone):
+    module = timefmt_in(zone)
+    if zone in DST_ZONES:
+        assert len(module.TRANSITIONS) > 1
+
+    for transition in module.TRANSITIONS:
+        start = datetime.fromtimestamp(transition, timezone.utc)
+        for minute in range(-150, 150):
+            dt = start + timedelta(minutes=minute, seconds=59)
+            assert module.format_local(dt) == expected(dt, zone), dt
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_outside_of_precomputed_range(timefmt_in, zone):
+    module = timefmt_in(zone)
+
+    for dt in (
+        datetime(1985, 3, 31, 1, 30, tzinfo=timezone.utc),
+        datetime(2090, 10, 29, 0, 59, tzinfo=timezone.utc),
+        datetime.fromtimestamp(module.RANGE_END, timezone.utc),
+    ):
+        assert module.format_local(dt) == expected(dt, zone), dt
+
+
+def test_other_offsets_and_naive_input():
+    moment = datetime(2026, 3, 29, 1, 15, tzinfo=timezone.utc)
+    zone = timefmt.settings.TZ_IANA
+
+    for dt in (moment, moment.astimezone(timezone(timedelta(hours=-7)))):
+        assert timefmt.format_local(dt) == expected(dt, zone)
+
+    # Naive datetimes are taken as system local time, like astimezone does
+    naive = datetime(2026, 3, 29, 1, 15)
+    assert timefmt.format_local(naive) == expected(naive, zone)